@@ -0,0 +1,139 @@
+"""Asyncio Syft Space API client."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from client import SyftClient
+from ratelimit import AdaptiveRateLimiter
+from retry import RetryBudget
+
+
+class AsyncSyftClient:
+    """Asyncio client for Syft Space API with the same surface as SyftClient.
+
+    Every method is a coroutine returning exactly what the SyftClient method
+    of the same name returns, including the ``(ok, result)`` tuples and the
+    409/"already exists" handling of ``create_dataset``/``create_endpoint``.
+    Requests run on a pooled SyftClient in the client's own pool of
+    ``max_in_flight`` worker threads (not the loop's default executor, which
+    is capped at a few dozen); a bounded semaphore caps how many are in
+    flight at once.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        max_in_flight: int = 10,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        on_unauthorized: Optional[Callable[[], str]] = None,
+    ):
+        self._client = SyftClient(
+            base_url, api_key, pool_size=max_in_flight, rate_limiter=rate_limiter, retry_budget=retry_budget,
+            on_unauthorized=on_unauthorized,
+        )
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="syft-async")
+        self._semaphore = asyncio.BoundedSemaphore(max_in_flight)
+        self.base_url = self._client.base_url
+        self.rate_limiter = self._client.rate_limiter
+        self.retry_budget = self._client.retry_budget
+        self.api_key = api_key
+        self.max_in_flight = max_in_flight
+
+    async def _call(self, method, *args):
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, method, *args)
+
+    async def close(self):
+        """Close the underlying session, its connection pool and the worker threads."""
+        # Waiting for in-flight calls blocks, so do it off the event loop
+        await asyncio.to_thread(self._executor.shutdown, True)
+        self._client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def check_connection(self) -> bool:
+        """Verify API connection."""
+        return await self._call(self._client.check_connection)
+
+    # -- Datasets --
+
+    async def list_datasets(self) -> list:
+        return await self._call(self._client.list_datasets)
+
+    async def get_dataset(self, name: str) -> Optional[dict]:
+        return await self._call(self._client.get_dataset, name)
+
+    async def create_dataset(self, payload: dict) -> tuple[bool, dict | str]:
+        return await self._call(self._client.create_dataset, payload)
+
+    async def delete_dataset(self, name: str) -> tuple[bool, str]:
+        return await self._call(self._client.delete_dataset, name)
+
+    # -- Endpoints --
+
+    async def list_endpoints(self) -> list:
+        return await self._call(self._client.list_endpoints)
+
+    async def get_endpoint(self, slug: str) -> Optional[dict]:
+        return await self._call(self._client.get_endpoint, slug)
+
+    async def create_endpoint(self, payload: dict) -> tuple[bool, dict | str]:
+        return await self._call(self._client.create_endpoint, payload)
+
+    async def update_endpoint(self, slug: str, payload: dict) -> tuple[bool, str]:
+        return await self._call(self._client.update_endpoint, slug, payload)
+
+    async def delete_endpoint(self, slug: str) -> tuple[bool, str]:
+        return await self._call(self._client.delete_endpoint, slug)
+
+    async def publish_endpoint(self, slug: str) -> tuple[bool, str]:
+        return await self._call(self._client.publish_endpoint, slug)
+
+
+class BlockingSyftClient:
+    """Blocking view of an AsyncSyftClient so the command modules can drive it.
+
+    Owns an event loop on a background thread; each method call submits the
+    matching coroutine to that loop and waits for its result.
+    """
+
+    def __init__(self, async_client: AsyncSyftClient):
+        self.async_client = async_client
+        self.base_url = async_client.base_url
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def __getattr__(self, name):
+        method = getattr(self.async_client, name)
+        if not asyncio.iscoroutinefunction(method):
+            return method
+
+        def call(*args, **kwargs):
+            return self._run(method(*args, **kwargs))
+
+        return call
+
+    def close(self):
+        """Close the async client and stop the background loop."""
+        self._run(self.async_client.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
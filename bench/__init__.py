@@ -0,0 +1 @@
+"""Benchmarks for syft-space-deploy. Run from the repo root, e.g. ``python -m bench.bench_client``."""
@@ -0,0 +1,54 @@
+"""Benchmark: per-call requests vs. the pooled SyftClient session.
+
+Starts the local Syft Space stub and measures requests/sec for the old
+module-level ``requests.get`` pattern and for ``SyftClient`` with its pooled
+session.
+
+    python -m bench.bench_client --requests 2000
+"""
+
+import argparse
+import time
+
+import requests
+
+from client import SyftClient
+from stubs.syft_space import StubServer
+
+
+def bench_unpooled(base_url: str, n: int) -> float:
+    """The pre-session pattern: fresh headers and connection per call."""
+    start = time.perf_counter()
+    for _ in range(n):
+        headers = {"Authorization": "Bearer bench", "Content-Type": "application/json"}
+        r = requests.get(f"{base_url}/datasets/", headers=headers, timeout=30)
+        r.raise_for_status()
+    return n / (time.perf_counter() - start)
+
+
+def bench_pooled(base_url: str, n: int) -> float:
+    # No rate limiter, so only connection handling is measured
+    with SyftClient(base_url, "bench") as client:
+        start = time.perf_counter()
+        for _ in range(n):
+            client.list_datasets()
+        return n / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per run (default: 1000)")
+    args = parser.parse_args()
+
+    with StubServer() as server:
+        before = bench_unpooled(server.base_url, args.requests)
+        after = bench_pooled(server.base_url, args.requests)
+
+    print(f"Requests per run:       {args.requests}")
+    print(f"Unpooled (requests.get): {before:8.1f} req/s")
+    print(f"Pooled (SyftClient):     {after:8.1f} req/s")
+    print(f"Speedup:                 {after / before:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
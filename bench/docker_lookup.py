@@ -0,0 +1,145 @@
+"""API key auto-detection benchmark: docker CLI per container vs. batched CLI vs. Engine API.
+
+Starts the Docker Engine stub (stubs/docker_engine.py) on a temporary
+unix socket with --containers running containers, and puts a stand-in
+`docker` executable on PATH that answers `ps` and `inspect` from the stub.
+It then times three lookups of the Syft Space container's key:
+
+- per-container: the old resolve_api_key (docker ps, then two docker
+  inspect calls per container until the port matches; 1+2N processes)
+- batched CLI: docker ps + one docker inspect of every container
+- Engine API: two HTTP calls over the socket (docker_api.find_container_key)
+- cached: one inspect call confirming a cached mapping (docker_api.ApiKeyCache)
+
+Finally it times `main.py list` end to end against the Syft Space stub:
+key auto-detected through the socket, from a warm key cache, and given
+with --api-key.
+The stand-in CLI is a Python script, which starts faster than the real
+Go binary, so the CLI numbers are a lower bound.
+
+    python -m bench.docker_lookup --containers 40
+"""
+
+import argparse
+import json
+import os
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from docker_api import ApiKeyCache, _find_with_api, _find_with_cli, resolve_container_key
+from stubs.docker_engine import DockerStubServer, fake_containers
+from stubs.syft_space import StubServer
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+_FAKE_DOCKER = '''#!{python}
+import json, os, sys
+sys.path.insert(0, {repo!r})
+from docker_api import DockerClient
+
+args = sys.argv[1:]
+with DockerClient(os.environ["DOCKER_STUB_SOCKET"]) as docker:
+    if args[0] == "ps":
+        for c in docker.containers():
+            print(c["Id"] if "-q" in args else c["Names"][0].lstrip("/"))
+    elif args[0] == "inspect":
+        fmt = args[args.index("--format") + 1] if "--format" in args else None
+        infos = [docker.inspect(a) for a in args[1:] if a not in ("--format", fmt)]
+        if fmt is None:
+            print(json.dumps(infos))
+        elif "HostPort" in fmt:
+            print(" ".join(b["HostPort"] for i in infos for g in i["NetworkSettings"]["Ports"].values() for b in g or []))
+        else:
+            print("\\n".join(e for i in infos for e in i["Config"]["Env"]))
+'''
+
+
+def per_container_lookup(port: int) -> str:
+    """The original resolve_api_key: docker ps, then two docker inspect calls per container."""
+    result = subprocess.run(["docker", "ps", "--format", "{{.Names}}"], capture_output=True, text=True, timeout=5)
+    for name in result.stdout.strip().splitlines():
+        inspect = subprocess.run(
+            ["docker", "inspect", name, "--format",
+             "{{range $p, $b := .NetworkSettings.Ports}}{{range $b}}{{.HostPort}} {{end}}{{end}}"],
+            capture_output=True, text=True, timeout=5,
+        )
+        if str(port) in inspect.stdout.split():
+            env_out = subprocess.run(
+                ["docker", "inspect", name, "--format", "{{range .Config.Env}}{{println .}}{{end}}"],
+                capture_output=True, text=True, timeout=5,
+            )
+            for line in env_out.stdout.splitlines():
+                if line.startswith("SYFT_ADMIN_API_KEY="):
+                    return line.split("=", 1)[1]
+    return ""
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--containers", type=int, default=40, help="Running containers (default: 40)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per method; the best is reported (default: 3)")
+    parser.add_argument("--output", type=Path, default=None, help="Also write the results as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, StubServer() as syft:
+        port = syft.httpd.server_address[1]
+        socket_path = os.path.join(tmp, "docker.sock")
+        fake = Path(tmp) / "docker"
+        fake.write_text(_FAKE_DOCKER.format(python=sys.executable, repo=str(REPO_ROOT)))
+        fake.chmod(fake.stat().st_mode | stat.S_IEXEC)
+        os.environ["PATH"] = f"{tmp}{os.pathsep}{os.environ['PATH']}"
+        os.environ["DOCKER_STUB_SOCKET"] = socket_path
+
+        with DockerStubServer(socket_path, fake_containers(args.containers, port, "bench-key")):
+            assert per_container_lookup(port) == _find_with_cli(port).api_key == _find_with_api(port, socket_path).api_key
+            results = {
+                "per_container_cli_s": _time(lambda: per_container_lookup(port), args.repeat),
+                "batched_cli_s": _time(lambda: _find_with_cli(port), args.repeat),
+                "engine_api_s": _time(lambda: _find_with_api(port, socket_path), args.repeat),
+            }
+            cache = ApiKeyCache(Path(tmp) / "keys.json")
+            resolve_container_key(port, socket_path, cache)
+            results["cached_s"] = _time(lambda: resolve_container_key(port, socket_path, cache), args.repeat)
+
+            base = [sys.executable, str(REPO_ROOT / "main.py"), "--api-url", syft.base_url, "--docker-socket", socket_path]
+            results["main_list_autodetect_s"] = _time(
+                lambda: subprocess.run(base + ["--no-api-key-cache", "list"], capture_output=True, check=True),
+                args.repeat,
+            )
+            cached = base + ["--api-key-cache", str(Path(tmp) / "main-keys.json"), "list"]
+            subprocess.run(cached, capture_output=True, check=True)
+            results["main_list_cached_s"] = _time(
+                lambda: subprocess.run(cached, capture_output=True, check=True), args.repeat
+            )
+            results["main_list_api_key_s"] = _time(
+                lambda: subprocess.run(base + ["--api-key", "bench-key", "list"], capture_output=True, check=True),
+                args.repeat,
+            )
+
+    print(f"Containers:               {args.containers}")
+    print(f"Per-container CLI:        {results['per_container_cli_s'] * 1000:8.1f} ms ({1 + 2 * args.containers} processes)")
+    print(f"Batched CLI:              {results['batched_cli_s'] * 1000:8.1f} ms (2 processes)")
+    print(f"Engine API:               {results['engine_api_s'] * 1000:8.1f} ms (2 HTTP calls)")
+    print(f"Cached:                   {results['cached_s'] * 1000:8.1f} ms (1 HTTP call)")
+    print(f"main.py list (auto):      {results['main_list_autodetect_s'] * 1000:8.1f} ms")
+    print(f"main.py list (cached):    {results['main_list_cached_s'] * 1000:8.1f} ms")
+    print(f"main.py list (--api-key): {results['main_list_api_key_s'] * 1000:8.1f} ms")
+    if args.output:
+        args.output.write_text(json.dumps({"containers": args.containers, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Dataset discovery benchmark: per-path stats vs. one scandir pass vs. the source index.
+
+Times what a command needs to know about every dataset (is it a
+directory, does it have a journal_description.md, which metadata files it
+has), first the way the commands used to collect it (iterdir + is_dir +
+exists per dataset + a metadata listing) and then with
+utils.scan_datasets. It times the full-tree extension histograms deploy
+builds (utils.scan_file_types), then builds a source index
+(source_index.py) and times a refresh of the unchanged tree. The tree is built with bench.treegen if it
+doesn't exist yet; the page cache is warmed before timing.
+
+    python -m bench.scan /tmp/scan-tree --datasets 100000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from bench.treegen import generate_tree
+from source_index import SourceIndex
+from utils import DESCRIPTION_FILENAME, scan_datasets, scan_file_types
+
+
+def legacy_scan(source_dir: Path) -> list[tuple[str, bool, list[Path]]]:
+    """Path-based discovery: a stat per entry, then per-dataset exists and listing."""
+    records = []
+    for item in sorted(source_dir.iterdir()):
+        if item.is_dir() and not item.name.startswith("."):
+            has_description = (item / DESCRIPTION_FILENAME).exists()
+            metadata = sorted(p for p in item.iterdir() if p.suffix in (".json", ".jsonl") and p.is_file())
+            records.append((item.name, has_description, metadata))
+    return records
+
+
+def _time(fn, repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len(fn())
+        best = min(best, time.perf_counter() - start)
+    return best, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("root", type=Path, help="Tree to scan (created if missing)")
+    parser.add_argument("--datasets", type=int, default=100_000, help="Datasets to create if the tree is missing (default: 100000)")
+    parser.add_argument("--workers", type=int, default=16, help="File type scan and index refresh threads (default: 16)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per method; the best is reported (default: 3)")
+    args = parser.parse_args()
+
+    if not args.root.exists():
+        print(f"Building {args.datasets} datasets in {args.root}...")
+        generate_tree(args.root, datasets=args.datasets, files_per_dataset=1, file_bytes=16, metadata_items=1)
+
+    scan_datasets(args.root)  # warm the dentry/inode caches
+    legacy, count = _time(lambda: legacy_scan(args.root), args.repeat)
+    scanned, count = _time(lambda: scan_datasets(args.root), args.repeat)
+    print(f"Datasets:       {count}")
+    print(f"Path-based:     {legacy:.3f}s ({count / legacy:,.0f} datasets/s)")
+    print(f"scan_datasets:  {scanned:.3f}s ({count / scanned:,.0f} datasets/s)")
+    print(f"Speedup:        {legacy / scanned:.1f}x")
+
+    datasets = scan_datasets(args.root)
+    start = time.perf_counter()
+    scan_file_types(datasets, args.workers)
+    print(f"File types:     {time.perf_counter() - start:.3f}s (lists every directory, {args.workers} workers)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = Path(tmp) / "index.db"
+        start = time.perf_counter()
+        with SourceIndex(index_path, workers=args.workers) as index:
+            index.refresh(args.root)
+        built = time.perf_counter() - start
+        # Directories modified within the last two seconds are always rescanned
+        time.sleep(2)
+
+        def refresh():
+            with SourceIndex(index_path, workers=args.workers) as index:
+                return index.refresh(args.root)
+
+        refreshed, count = _time(refresh, args.repeat)
+    print(f"Index build:    {built:.3f}s (walks every file)")
+    print(f"Index refresh:  {refreshed:.3f}s (unchanged tree, {args.workers} workers)")
+
+
+if __name__ == "__main__":
+    main()
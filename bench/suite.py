@@ -0,0 +1,222 @@
+"""End-to-end benchmark suite for the CLI commands.
+
+Generates a synthetic dataset tree, starts the local Syft Space and
+OpenRouter stubs, and runs each command in a subprocess (list, deploy,
+update, publish, generate, generate-cached, delete), recording wall time,
+requests/sec, peak RSS and a per-route breakdown of server-side requests
+and time. Results are written as JSON;
+--save-baseline stores them as the baseline and --compare fails when a
+scenario's wall time regresses past --threshold.
+
+    python -m bench.suite --datasets 500 --workers 8 --save-baseline
+    python -m bench.suite --datasets 500 --workers 8 --compare
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bench.treegen import add_tree_arguments, tree_from_args
+from stubs.openrouter import LLMStubServer, add_llm_stub_arguments, llm_config_from_args
+from stubs.syft_space import StubConfig, StubServer
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+MAIN = REPO_ROOT / "main.py"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+# Order matters: later scenarios operate on what deploy created
+SCENARIOS = ("list", "deploy", "update", "publish", "generate", "generate-cached", "delete")
+
+
+def _scenario_args(name: str, tree: Path, descriptions: Path, workdir: Path, args, llm: LLMStubServer) -> list[str]:
+    if name == "list":
+        return ["list"]
+    if name == "deploy":
+        return [
+            "deploy", "--source-dir", str(tree), "--container-dir", "/data/bench",
+            "--workers", str(args.workers), "--delay", "0", "--progress-file", str(workdir / "progress.db"),
+        ]
+    if name == "update":
+        return [
+            "update", "--descriptions", str(descriptions), "--delay", "0",
+            "--progress-file", str(workdir / "progress.db"),
+        ]
+    if name == "publish":
+        return ["publish", "--delay", "0"]
+    if name in ("generate", "generate-cached"):
+        # generate starts with an empty LLM cache; generate-cached reruns it against the warm cache
+        return [
+            "generate", "--source-dir", str(tree), "--output", str(workdir / f"{name}.jsonl"),
+            "--llm-base-url", llm.base_url, "--llm-cache-dir", str(workdir / "llm_cache"),
+            "--concurrency", str(args.concurrency), "--batch-size", str(args.batch_size), "--delay", "0",
+        ]
+    if name == "delete":
+        return ["delete", "--yes", "--delay", "0"]
+    raise ValueError(f"unknown scenario '{name}'")
+
+
+def _delta(before: dict, after: dict) -> dict:
+    return {key: after.get(key, 0) - before.get(key, 0) for key in after if after.get(key, 0) != before.get(key, 0)}
+
+
+def _stats(stubs: list[StubServer]) -> dict:
+    """Sum the request counters of several stubs (route names don't overlap)."""
+    total = {"requests": 0, "by_route": {}, "seconds_by_route": {}}
+    for stub in stubs:
+        stats = stub.state.stats()
+        total["requests"] += stats["requests"]
+        total["by_route"].update(stats["by_route"])
+        total["seconds_by_route"].update(stats["seconds_by_route"])
+    return total
+
+
+def run_scenario(name: str, cli_args: list[str], stubs: list[StubServer], workdir: Path, max_rate: float) -> dict:
+    """Run one CLI command in a subprocess and measure it (stubs[0] is the Syft Space stub)."""
+    command = [
+        sys.executable, str(MAIN), "--api-url", stubs[0].base_url, "--api-key", "bench",
+        "--max-rate", str(max_rate), *cli_args,
+    ]
+    env = {**os.environ, "OPENROUTER_API_KEY": "bench"}
+    before = _stats(stubs)
+    log_path = workdir / f"{name}.log"
+    with open(log_path, "w") as log:
+        start = time.perf_counter()
+        proc = subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT, cwd=workdir, env=env)
+        # wait4 gives this child's own rusage, so peak RSS is per scenario
+        _, status, rusage = os.wait4(proc.pid, 0)
+        wall = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    after = _stats(stubs)
+
+    requests_made = after["requests"] - before["requests"]
+    peak_rss_kb = rusage.ru_maxrss if sys.platform != "darwin" else rusage.ru_maxrss / 1024
+    counts = _delta(before["by_route"], after["by_route"])
+    seconds = _delta(before["seconds_by_route"], after["seconds_by_route"])
+    return {
+        "scenario": name,
+        "exit_code": proc.returncode,
+        "wall_s": round(wall, 4),
+        "requests": requests_made,
+        "requests_per_sec": round(requests_made / wall, 2) if wall > 0 else 0.0,
+        "peak_rss_mb": round(peak_rss_kb / 1024, 1),
+        "phases": {
+            route: {"requests": counts.get(route, 0), "server_s": round(seconds.get(route, 0.0), 4)}
+            for route in sorted(set(counts) | set(seconds))
+        },
+        "log": str(log_path),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return a message for every scenario slower than baseline by more than threshold."""
+    previous = {r["scenario"]: r for r in baseline.get("results", [])}
+    regressions = []
+    for result in results["results"]:
+        old = previous.get(result["scenario"])
+        if not old or old["wall_s"] <= 0:
+            continue
+        ratio = result["wall_s"] / old["wall_s"]
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{result['scenario']}: {result['wall_s']:.2f}s vs baseline {old['wall_s']:.2f}s ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_tree_arguments(parser)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenarios to run")
+    parser.add_argument("--workers", type=int, default=4, help="deploy --workers (default: 4)")
+    parser.add_argument("--max-rate", type=float, default=1000.0, help="CLI --max-rate (default: 1000)")
+    parser.add_argument("--latency", default="2", help="Stub latency spec in ms (default: 2)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Stub 5xx error rate")
+    parser.add_argument("--concurrency", type=int, default=8, help="generate --concurrency (default: 8)")
+    parser.add_argument("--batch-size", type=int, default=1, help="generate --batch-size (default: 1)")
+    add_llm_stub_arguments(parser, prefix="llm-")
+    parser.set_defaults(llm_latency="50", llm_tokens_per_sec=2000.0)
+    parser.add_argument("--output", type=Path, default=Path("bench_results.json"), help="Results JSON path")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON path")
+    parser.add_argument("--save-baseline", action="store_true", help="Also write results to --baseline")
+    parser.add_argument("--compare", action="store_true", help="Fail if slower than --baseline by --threshold")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown before failing (default: 0.2)")
+    args = parser.parse_args()
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    with tempfile.TemporaryDirectory(prefix="syft-bench-") as tmp:
+        workdir = Path(tmp)
+        start = time.perf_counter()
+        descriptions = tree_from_args(workdir / "tree", args)
+        print(f"Generated {args.datasets} datasets in {time.perf_counter() - start:.1f}s")
+
+        results = []
+        with StubServer(StubConfig(latency=args.latency, error_rate=args.error_rate)) as stub, \
+                LLMStubServer(llm_config_from_args(args, prefix="llm-")) as llm:
+            for name in scenarios:
+                cli_args = _scenario_args(name, workdir / "tree", descriptions, workdir, args, llm)
+                result = run_scenario(name, cli_args, [stub, llm], workdir, args.max_rate)
+                results.append(result)
+                status = "ok" if result["exit_code"] == 0 else f"exit {result['exit_code']}"
+                print(
+                    f"  {name:<15} {result['wall_s']:8.2f}s  {result['requests']:6d} req  "
+                    f"{result['requests_per_sec']:8.1f} req/s  {result['peak_rss_mb']:7.1f} MB  {status}"
+                )
+                if result["exit_code"] != 0:
+                    print(open(result["log"]).read()[-2000:])
+                del result["log"]
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {
+            "datasets": args.datasets,
+            "files": args.files,
+            "metadata_items": args.metadata_items,
+            "abstract_bytes": args.abstract_bytes,
+            "workers": args.workers,
+            "latency": args.latency,
+            "error_rate": args.error_rate,
+            "concurrency": args.concurrency,
+            "batch_size": args.batch_size,
+            "llm_latency": args.llm_latency,
+            "llm_tokens_per_sec": args.llm_tokens_per_sec,
+            "llm_completion_tokens": args.llm_completion_tokens,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+
+    if args.compare:
+        if not args.baseline.exists():
+            print(f"No baseline at {args.baseline}; run with --save-baseline first")
+            return 1
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("params") != report["params"]:
+            print("Warning: baseline was recorded with different parameters")
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
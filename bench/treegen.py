@@ -0,0 +1,112 @@
+"""Synthetic dataset-tree generator for benchmarks.
+
+Builds a --source-dir style tree: one subdirectory per dataset, each with
+placeholder content files, a metadata JSON array, and (for a fraction of
+datasets) a journal_description.md. Also writes a descriptions JSON keyed
+by dataset name for the update benchmark.
+
+    python -m bench.treegen /tmp/bench-tree --datasets 1000 --files 20 --metadata-items 50
+"""
+
+import argparse
+import json
+import random
+from pathlib import Path
+
+from commands.generate import DESCRIPTION_FILENAME
+
+_WORDS = (
+    "analysis data model study journal review clinical theory method network "
+    "learning protein climate policy history signal quantum market language"
+).split()
+
+
+def _text(rng: random.Random, size: int) -> str:
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(_WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:size]
+
+
+def generate_tree(
+    root: Path,
+    datasets: int = 100,
+    files_per_dataset: int = 10,
+    file_bytes: int = 256,
+    metadata_items: int = 20,
+    abstract_bytes: int = 400,
+    description_ratio: float = 0.5,
+    extensions: tuple[str, ...] = (".pdf", ".txt"),
+    seed: int = 0,
+) -> Path:
+    """Create the tree under root and return the path of the descriptions JSON."""
+    rng = random.Random(seed)
+    root.mkdir(parents=True, exist_ok=True)
+    descriptions = {}
+    width = len(str(datasets))
+
+    for i in range(datasets):
+        name = f"journal-{i:0{width}d}"
+        dataset_dir = root / name
+        dataset_dir.mkdir(exist_ok=True)
+
+        payload = b"x" * file_bytes
+        for j in range(files_per_dataset):
+            (dataset_dir / f"doc-{j}{extensions[j % len(extensions)]}").write_bytes(payload)
+
+        items = [
+            {"title": _text(rng, 60).title(), "abstract": _text(rng, abstract_bytes)}
+            for _ in range(metadata_items)
+        ]
+        with open(dataset_dir / "metadata.json", "w") as f:
+            json.dump(items, f)
+
+        description = f"{name}: {_text(rng, 300)}"
+        descriptions[name] = description
+        if rng.random() < description_ratio:
+            (dataset_dir / DESCRIPTION_FILENAME).write_text(description)
+
+    descriptions_path = root.parent / f"{root.name}-descriptions.json"
+    with open(descriptions_path, "w") as f:
+        json.dump(descriptions, f)
+    return descriptions_path
+
+
+def add_tree_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--datasets", type=int, default=100, help="Number of dataset directories (default: 100)")
+    parser.add_argument("--files", type=int, default=10, help="Content files per dataset (default: 10)")
+    parser.add_argument("--file-bytes", type=int, default=256, help="Size of each content file (default: 256)")
+    parser.add_argument("--metadata-items", type=int, default=20, help="Items in each metadata.json (default: 20)")
+    parser.add_argument("--abstract-bytes", type=int, default=400, help="Abstract length per item (default: 400)")
+    parser.add_argument("--description-ratio", type=float, default=0.5, help="Fraction with journal_description.md (default: 0.5)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+
+
+def tree_from_args(root: Path, args) -> Path:
+    return generate_tree(
+        root,
+        datasets=args.datasets,
+        files_per_dataset=args.files,
+        file_bytes=args.file_bytes,
+        metadata_items=args.metadata_items,
+        abstract_bytes=args.abstract_bytes,
+        description_ratio=args.description_ratio,
+        seed=args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("root", type=Path, help="Directory to create the tree in")
+    add_tree_arguments(parser)
+    args = parser.parse_args()
+    descriptions_path = tree_from_args(args.root, args)
+    print(f"Wrote {args.datasets} datasets to {args.root}")
+    print(f"Descriptions JSON: {descriptions_path}")
+
+
+if __name__ == "__main__":
+    main()
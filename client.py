@@ -1,15 +1,61 @@
 """Syft Space API client."""
 
+import threading
+import time
+
 import requests
-from typing import Optional
+from requests.adapters import HTTPAdapter
+from typing import Callable, Optional
 
+from ratelimit import AdaptiveRateLimiter
+from retry import DEFAULT_POLICIES, RETRY_STATUSES, AlreadyCreated, RetryBudget, RetryPolicy
 
-class SyftClient:
-    """Client for Syft Space API."""
 
-    def __init__(self, base_url: str, api_key: str):
+class SyftClient:
+    """Client for Syft Space API.
+
+    Requests go through a single pooled ``requests.Session`` so connections
+    are kept alive and reused across calls. Use as a context manager (or call
+    ``close()``) to release the pool when done.
+
+    If ``rate_limiter`` is given, every request is paced by it, and it
+    adapts to 429/503 responses, Retry-After headers and latency; without
+    one requests are not paced. Transient failures are
+    retried per HTTP method (see ``retry.DEFAULT_POLICIES``) within the
+    shared ``retry_budget``.
+
+    If ``on_unauthorized`` is given, a 401 calls it for a fresh API key
+    (e.g. re-resolving it from Docker after a container restart); when it
+    returns a different key, the request is resent once with that key.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        pool_size: int = 10,
+        keep_alive: bool = True,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        retry_policies: Optional[dict[str, RetryPolicy]] = None,
+        on_unauthorized: Optional[Callable[[], str]] = None,
+    ):
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
+        self.on_unauthorized = on_unauthorized
+        self._auth_lock = threading.Lock()
+        self._rejected_keys: set[str] = set()
+        self.rate_limiter = rate_limiter
+        self.retry_budget = retry_budget or RetryBudget()
+        self.retry_policies = retry_policies or DEFAULT_POLICIES
+
+        self.session = requests.Session()
+        self.session.headers.update(self._headers())
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def _headers(self) -> dict:
         return {
@@ -17,14 +63,78 @@ class SyftClient:
             "Content-Type": "application/json",
         }
 
+    def _send(self, method: str, path: str, **kwargs) -> requests.Response:
+        """Send one rate-limited request, re-authorizing once on a 401 (see on_unauthorized)."""
+        api_key = self.api_key
+        r = self._send_once(method, path, **kwargs)
+        if r.status_code == 401 and self.on_unauthorized and self._reauthorize(api_key):
+            r = self._send_once(method, path, **kwargs)
+        return r
+
+    def _reauthorize(self, rejected_key: str) -> bool:
+        """Replace a key the server rejected; True if there is a different key to retry with."""
+        with self._auth_lock:
+            # Concurrent 401s for the same key trigger one lookup, and a key
+            # that has been looked up and rejected once is not looked up again
+            if self.api_key == rejected_key and rejected_key not in self._rejected_keys:
+                self._rejected_keys.add(rejected_key)
+                new_key = self.on_unauthorized()
+                if new_key:
+                    self.api_key = new_key
+                    self.session.headers["Authorization"] = f"Bearer {new_key}"
+            return self.api_key != rejected_key
+
+    def _send_once(self, method: str, path: str, **kwargs) -> requests.Response:
+        """Send one request, paced by the rate limiter (if any) and fed back to it."""
+        limiter = self.rate_limiter
+        if limiter is None:
+            return self.session.request(method, f"{self.base_url}{path}", **kwargs)
+        limiter.acquire()
+        start = time.monotonic()
+        try:
+            r = self.session.request(method, f"{self.base_url}{path}", **kwargs)
+        except requests.RequestException:
+            limiter.record(None, time.monotonic() - start)
+            raise
+        limiter.record(r.status_code, time.monotonic() - start, r.headers.get("Retry-After"))
+        return r
+
+    def _request(self, method: str, path: str, before_retry=None, **kwargs) -> requests.Response:
+        """Send a request, retrying transient failures under the method's policy.
+
+        before_retry, if given, runs before each resend; returning a resource
+        raises AlreadyCreated so a create that actually landed isn't repeated.
+        """
+        policy = self.retry_policies[method]
+        for attempt in range(policy.max_attempts):
+            last = attempt == policy.max_attempts - 1
+            try:
+                r = self._send(method, path, **kwargs)
+                if r.status_code not in RETRY_STATUSES or last or not self.retry_budget.take():
+                    return r
+            except (requests.ConnectionError, requests.Timeout):
+                if last or not self.retry_budget.take():
+                    raise
+            time.sleep(policy.backoff(attempt))
+            if before_retry:
+                existing = before_retry()
+                if existing:
+                    raise AlreadyCreated(existing)
+
+    def close(self):
+        """Close the underlying session and its connection pool."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
     def check_connection(self) -> bool:
         """Verify API connection."""
         try:
-            r = requests.get(
-                f"{self.base_url}/datasets/types/",
-                headers=self._headers(),
-                timeout=10,
-            )
+            r = self._request("GET", "/datasets/types/", timeout=10)
             return r.status_code == 200
         except Exception:
             return False
@@ -32,27 +142,27 @@ class SyftClient:
     # -- Datasets --
 
     def list_datasets(self) -> list:
-        r = requests.get(
-            f"{self.base_url}/datasets/", headers=self._headers(), timeout=30
-        )
+        r = self._request("GET", "/datasets/", timeout=30)
         r.raise_for_status()
         return r.json()
 
     def get_dataset(self, name: str) -> Optional[dict]:
-        r = requests.get(
-            f"{self.base_url}/datasets/{name}", headers=self._headers(), timeout=10
-        )
+        r = self._request("GET", f"/datasets/{name}", timeout=10)
         if r.status_code == 200:
             return r.json()
         return None
 
     def create_dataset(self, payload: dict) -> tuple[bool, dict | str]:
-        r = requests.post(
-            f"{self.base_url}/datasets/",
-            headers=self._headers(),
-            json=payload,
-            timeout=30,
-        )
+        try:
+            r = self._request(
+                "POST",
+                "/datasets/",
+                before_retry=lambda: self.get_dataset(payload["name"]),
+                json=payload,
+                timeout=30,
+            )
+        except AlreadyCreated as e:
+            return True, e.resource
         if r.status_code == 201:
             return True, r.json()
         elif r.status_code == 409 or "already exists" in r.text.lower():
@@ -63,9 +173,7 @@ class SyftClient:
         return False, f"{r.status_code}: {r.text[:200]}"
 
     def delete_dataset(self, name: str) -> tuple[bool, str]:
-        r = requests.delete(
-            f"{self.base_url}/datasets/{name}", headers=self._headers(), timeout=30
-        )
+        r = self._request("DELETE", f"/datasets/{name}", timeout=30)
         if r.status_code in [200, 204]:
             return True, "Deleted"
         elif r.status_code == 404:
@@ -75,27 +183,27 @@ class SyftClient:
     # -- Endpoints --
 
     def list_endpoints(self) -> list:
-        r = requests.get(
-            f"{self.base_url}/endpoints/", headers=self._headers(), timeout=30
-        )
+        r = self._request("GET", "/endpoints/", timeout=30)
         r.raise_for_status()
         return r.json()
 
     def get_endpoint(self, slug: str) -> Optional[dict]:
-        r = requests.get(
-            f"{self.base_url}/endpoints/{slug}", headers=self._headers(), timeout=10
-        )
+        r = self._request("GET", f"/endpoints/{slug}", timeout=10)
         if r.status_code == 200:
             return r.json()
         return None
 
     def create_endpoint(self, payload: dict) -> tuple[bool, dict | str]:
-        r = requests.post(
-            f"{self.base_url}/endpoints/",
-            headers=self._headers(),
-            json=payload,
-            timeout=30,
-        )
+        try:
+            r = self._request(
+                "POST",
+                "/endpoints/",
+                before_retry=lambda: self.get_endpoint(payload["slug"]),
+                json=payload,
+                timeout=30,
+            )
+        except AlreadyCreated as e:
+            return True, e.resource
         if r.status_code == 201:
             return True, r.json()
         elif r.status_code == 409 or "already exists" in r.text.lower():
@@ -103,20 +211,13 @@ class SyftClient:
         return False, f"{r.status_code}: {r.text[:200]}"
 
     def update_endpoint(self, slug: str, payload: dict) -> tuple[bool, str]:
-        r = requests.patch(
-            f"{self.base_url}/endpoints/{slug}",
-            headers=self._headers(),
-            json=payload,
-            timeout=30,
-        )
+        r = self._request("PATCH", f"/endpoints/{slug}", json=payload, timeout=30)
         if r.status_code == 200:
             return True, "Updated"
         return False, f"{r.status_code}: {r.text[:200]}"
 
     def delete_endpoint(self, slug: str) -> tuple[bool, str]:
-        r = requests.delete(
-            f"{self.base_url}/endpoints/{slug}", headers=self._headers(), timeout=30
-        )
+        r = self._request("DELETE", f"/endpoints/{slug}", timeout=30)
         if r.status_code in [200, 204]:
             return True, "Deleted"
         elif r.status_code == 404:
@@ -124,9 +225,9 @@ class SyftClient:
         return False, f"{r.status_code}: {r.text[:200]}"
 
     def publish_endpoint(self, slug: str) -> tuple[bool, str]:
-        r = requests.post(
-            f"{self.base_url}/endpoints/{slug}/publish",
-            headers=self._headers(),
+        r = self._request(
+            "POST",
+            f"/endpoints/{slug}/publish",
             json={"publish_to_all_marketplaces": True},
             timeout=30,
         )
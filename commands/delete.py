@@ -1,7 +1,5 @@
 """Delete datasets and/or endpoints."""
 
-import time
-
 from client import SyftClient
 
 
@@ -37,7 +35,6 @@ def cmd_delete(client: SyftClient, args):
                     ok, msg = client.delete_endpoint(slug)
                     status = "Deleted" if ok else f"Failed: {msg}"
                     print(f"  [{i}/{len(endpoints)}] {slug}: {status}")
-                    time.sleep(args.delay)
             print(f"\nEndpoints: {len(endpoints)} processed")
         except Exception as e:
             print(f"Error listing endpoints: {e}")
@@ -55,9 +52,12 @@ def cmd_delete(client: SyftClient, args):
                     ok, msg = client.delete_dataset(name)
                     status = "Deleted" if ok else f"Failed: {msg}"
                     print(f"  [{i}/{len(datasets)}] {name}: {status}")
-                    time.sleep(args.delay)
             print(f"\nDatasets: {len(datasets)} processed")
         except Exception as e:
             print(f"Error listing datasets: {e}")
 
+    if not args.dry_run:
+        print(f"\nRate: {client.rate_limiter.summary()}")
+        print(f"Retries: {client.retry_budget.summary()}")
+
     return 0
@@ -1,14 +1,23 @@
 """Deploy datasets and endpoints to Syft Space."""
 
 import os
-import json
+import threading
 import time
-from pathlib import Path
+from collections import Counter
 
 from client import SyftClient
-from utils import discover_datasets, detect_file_types, load_progress, save_progress, slugify
+from descriptions_store import load_descriptions
+from llm_cache import open_llm_cache
+from pipeline import Pipeline, Stage
+from reconcile import MANAGED_FIELDS, Plan, build_plan
+from progress_store import open_progress
+from source_index import load_datasets
+from utils import DatasetInfo, fingerprint, scan_file_types, slugify
+from commands.publish import _needs_publish
 from commands.generate import (
     DESCRIPTION_FILENAME,
+    DEFAULT_LLM_BASE_URL,
+    DEFAULT_SAMPLE_COUNT,
     DEFAULT_SYSTEM_PROMPT,
     DEFAULT_USER_PROMPT_TEMPLATE,
     load_metadata,
@@ -17,15 +26,18 @@ from commands.generate import (
 )
 
 
-def _resolve_description(dataset_dir: Path, name: str, descriptions: dict, generate_missing: bool, dry_run: bool) -> str:
+def _resolve_description(
+    dataset: DatasetInfo, descriptions: dict, generate_missing: bool, dry_run: bool, log=print,
+    llm_cache=None, llm_base_url: str = DEFAULT_LLM_BASE_URL,
+) -> str:
     """Resolve description for a dataset.
 
     Priority: journal_description.md in dataset dir > --descriptions JSON > generate if missing > empty.
     """
-    # 1. Check for journal_description.md in dataset directory
-    md_path = dataset_dir / DESCRIPTION_FILENAME
-    if md_path.exists():
-        return md_path.read_text().strip()
+    name = dataset.name
+    # 1. Check for journal_description.md in dataset directory (known from the scan)
+    if dataset.has_description:
+        return dataset.description_path.read_text().strip()
 
     # 2. Check --descriptions JSON
     if name in descriptions:
@@ -35,36 +47,340 @@ def _resolve_description(dataset_dir: Path, name: str, descriptions: dict, gener
     if generate_missing:
         api_key = os.getenv("OPENROUTER_API_KEY", "")
         if not api_key:
-            print("    No OPENROUTER_API_KEY set, cannot generate description")
+            log("    No OPENROUTER_API_KEY set, cannot generate description")
             return ""
 
-        items = load_metadata(dataset_dir)
+        items = load_metadata(dataset, DEFAULT_SAMPLE_COUNT)
         if not items:
-            print("    No metadata to generate description from")
+            log("    No metadata to generate description from")
             return ""
 
         if dry_run:
-            print(f"    [DRY RUN] Would generate {DESCRIPTION_FILENAME}")
+            log(f"    [DRY RUN] Would generate {DESCRIPTION_FILENAME}")
             return "[would be generated]"
 
         samples_text = format_samples(items)
-        print("    Generating description...", end=" ")
         description = generate_one(
             name, samples_text,
             DEFAULT_SYSTEM_PROMPT, DEFAULT_USER_PROMPT_TEMPLATE,
-            "anthropic/claude-3.5-sonnet", api_key,
+            "anthropic/claude-3.5-sonnet", api_key, log=log, cache=llm_cache, base_url=llm_base_url,
         )
         if description:
-            md_path.write_text(description)
-            print(f"wrote {DESCRIPTION_FILENAME} ({len(description)} chars)")
+            dataset.description_path.write_text(description)
+            dataset.has_description = True
+            log(f"    Generating description... wrote {DESCRIPTION_FILENAME} ({len(description)} chars)")
             return description
         else:
-            print("failed")
+            log("    Generating description... failed")
             return ""
 
     return ""
 
 
+STAGES = ("describe", "dataset", "endpoint", "publish")
+
+# ingestFileTypeOptions for a dataset with no files to detect types from
+DEFAULT_FILE_TYPES = [".pdf", ".json"]
+
+
+class _DeployJob:
+    """Per-dataset state carried through the deploy pipeline."""
+
+    __slots__ = ("index", "name", "dataset", "lines", "description", "dataset_id", "changes", "publish", "failed")
+
+    def __init__(self, index: int, dataset: DatasetInfo, header: str):
+        self.index = index
+        self.name = dataset.name
+        self.dataset = dataset
+        self.lines = [header]
+        self.description: str | None = None
+        self.dataset_id: str | None = None
+        self.changes: dict = {}
+        self.publish = False
+        self.failed = False
+
+
+def _parse_stage_options(text: str, cast) -> dict:
+    """Parse 'describe=4,publish=2' into {"describe": 4, "publish": 2}."""
+    options = {}
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        stage, _, value = part.partition("=")
+        if stage not in STAGES:
+            raise ValueError(f"unknown stage '{stage}' (expected one of: {', '.join(STAGES)})")
+        options[stage] = cast(value)
+    return options
+
+
+def api_workers(args) -> int:
+    """Threads that may call the API at once: the dataset, endpoint, publish and update stage workers."""
+    try:
+        workers = _parse_stage_options(args.stage_workers, int)
+    except ValueError:
+        # cmd_deploy reports the bad option
+        workers = {}
+    total = sum(max(1, workers.get(stage, args.workers)) for stage in ("dataset", "endpoint"))
+    # The update stage (and the publish stage after it) runs alongside the main pipeline
+    total += max(1, args.workers)
+    if args.publish:
+        total += 2 * max(1, workers.get("publish", args.workers))
+    return total
+
+
+def _histogram_types(dataset: DatasetInfo) -> list[str]:
+    return sorted(dataset.extensions) if dataset.extensions else DEFAULT_FILE_TYPES
+
+
+def _detect_file_types(datasets: list[DatasetInfo], workers: int) -> dict[str, list[str]]:
+    """Map each dataset to the extensions found anywhere in its directory tree."""
+    start = time.monotonic()
+    walked = scan_file_types(datasets, workers)
+    elapsed = time.monotonic() - start
+    # How many datasets contain each type, for the startup report
+    counts = Counter(ext for dataset in datasets for ext in dataset.extensions)
+    file_types = {dataset.name: _histogram_types(dataset) for dataset in datasets}
+    empty = sum(1 for dataset in datasets if not dataset.extensions)
+    if walked:
+        print(f"Scanned file types of {walked} datasets in {elapsed:.1f}s")
+    if counts:
+        listed = ", ".join(f"{ext} ({n})" for ext, n in counts.most_common(10))
+        more = f" and {len(counts) - 10} more" if len(counts) > 10 else ""
+        print(f"Auto-detected file types (datasets): {listed}{more}")
+    if empty:
+        print(f"Warning: No files in {empty} datasets, using {DEFAULT_FILE_TYPES} for them")
+    return file_types
+
+
+def _dataset_payload(args, name: str, file_types: list[str]) -> dict:
+    container_path = f"{args.container_dir}/{name}"
+    return {
+        "name": slugify(args.name_template.format(name=name)),
+        "dtype": "local_file",
+        "configuration": {
+            "filePaths": [{"path": container_path, "description": name}],
+            "ingestFileTypeOptions": file_types,
+        },
+        "summary": args.summary_template.format(name=name.replace("-", " ").title()),
+        "tags": args.tags,
+    }
+
+
+def _endpoint_payload(args, name: str, description: str | None, dataset_id: str | None = None) -> dict:
+    endpoint_slug = slugify(args.slug_template.format(name=name))
+    payload = {
+        "name": endpoint_slug,
+        "slug": endpoint_slug,
+        "description": description,
+        "summary": args.summary_template.format(name=name.replace("-", " ").title()),
+        "response_type": args.response_type,
+        "published": args.publish,
+        "tags": args.tags,
+    }
+    if dataset_id:
+        payload["dataset_id"] = dataset_id
+    return payload
+
+
+def _known_description(dataset: DatasetInfo, descriptions: dict, generate_missing: bool) -> str | None:
+    """Description deploy would use, without calling the LLM; None if it would have to generate one."""
+    if dataset.has_description:
+        return dataset.description_path.read_text().strip()
+    if dataset.name in descriptions:
+        return descriptions[dataset.name]
+    return None if generate_missing else ""
+
+
+def _payload_fingerprints(dataset_payload: dict, endpoint_payload: dict) -> dict:
+    """Hash the dataset payload whole and each managed endpoint field separately.
+
+    Per-field hashes let a later run PATCH only the fields that changed.
+    Fields that aren't known yet (None) are left out.
+    """
+    return {
+        "dataset": fingerprint(dataset_payload),
+        "endpoint": {
+            field: fingerprint(endpoint_payload[field])
+            for field in MANAGED_FIELDS
+            if endpoint_payload.get(field) is not None
+        },
+    }
+
+
+def _fingerprint_changes(stored: dict, dataset_payload: dict | None, endpoint_payload: dict) -> tuple[bool, dict]:
+    """Compare current payloads with stored fingerprints.
+
+    Returns (dataset_changed, endpoint fields to PATCH). A description of
+    None (would need generating) is treated as unchanged, and so is a
+    dataset_payload of None (file types not detected).
+    """
+    current = _payload_fingerprints(dataset_payload, endpoint_payload)
+    changes = {
+        field: endpoint_payload[field]
+        for field, digest in current["endpoint"].items()
+        if endpoint_payload.get(field) is not None and stored["endpoint"].get(field) != digest
+    }
+    return dataset_payload is not None and stored["dataset"] != current["dataset"], changes
+
+
+def _publish_handler(client: SyftClient, args):
+    def publish(job: _DeployJob) -> bool:
+        slug = slugify(args.slug_template.format(name=job.name))
+        if args.dry_run:
+            job.lines.append(f"    [DRY RUN] Would publish to marketplace: {slug}")
+            return True
+        # Actually publish to marketplace(s) if --publish was set
+        pub_ok, pub_msg = client.publish_endpoint(slug)
+        if pub_ok:
+            job.lines.append("    Published to marketplace")
+        else:
+            job.lines.append(f"    Publish to marketplace failed: {pub_msg}")
+        return True
+
+    return publish
+
+
+def _build_stages(
+    client: SyftClient, args, file_types: dict[str, list[str]], descriptions: dict, llm_cache=None
+) -> list[Stage]:
+    """Create the describe -> dataset -> endpoint -> publish stages for cmd_deploy."""
+
+    def ensure_description(job: _DeployJob):
+        # Datasets that don't need the LLM skip the describe stage entirely
+        if job.description is None:
+            job.description = _resolve_description(
+                job.dataset, descriptions, args.generate_missing, args.dry_run,
+                job.lines.append, llm_cache, args.llm_base_url,
+            )
+            if job.description:
+                source = DESCRIPTION_FILENAME if job.dataset.has_description else "JSON"
+                job.lines.append(f"    Description: {len(job.description)} chars (from {source})")
+
+    def describe(job: _DeployJob) -> bool:
+        ensure_description(job)
+        return True
+
+    def create_dataset(job: _DeployJob) -> bool:
+        ensure_description(job)
+        if job.dataset_id:
+            # --apply found the dataset already on the server; only the endpoint is missing
+            return True
+        dataset_payload = _dataset_payload(args, job.name, file_types[job.name])
+        dataset_name = dataset_payload["name"]
+
+        if args.dry_run:
+            job.lines.append(f"    [DRY RUN] Would create dataset: {dataset_name}")
+            return True
+
+        ok, result = client.create_dataset(dataset_payload)
+        if not ok:
+            job.lines.append(f"    Dataset failed: {result}")
+            job.failed = True
+            return False
+        job.lines.append(f"    Dataset: {dataset_name}")
+        job.dataset_id = result.get("id") if isinstance(result, dict) else None
+        return True
+
+    def create_endpoint(job: _DeployJob) -> bool:
+        ensure_description(job)
+        endpoint_payload = _endpoint_payload(args, job.name, job.description, job.dataset_id)
+        endpoint_slug = endpoint_payload["slug"]
+
+        if args.dry_run:
+            job.lines.append(f"    [DRY RUN] Would create endpoint: {endpoint_slug}")
+            if args.publish:
+                job.lines.append(f"    [DRY RUN] Would publish to marketplace: {endpoint_slug}")
+            return False
+
+        ok, result = client.create_endpoint(endpoint_payload)
+        if not ok:
+            job.lines.append(f"    Endpoint failed: {result}")
+            job.failed = True
+            return False
+        job.lines.append(f"    Endpoint: {endpoint_slug}")
+        return True
+
+    workers = _parse_stage_options(args.stage_workers, int)
+    rates = _parse_stage_options(args.stage_rates, float)
+    handlers = {
+        "describe": describe,
+        "dataset": create_dataset,
+        "endpoint": create_endpoint,
+        "publish": _publish_handler(client, args),
+    }
+    stage_names = STAGES if args.publish else STAGES[:-1]
+    return [
+        Stage(name, handlers[name], workers.get(name, args.workers), rates.get(name, 0.0))
+        for name in stage_names
+    ]
+
+
+def _update_stages(client: SyftClient, args) -> list[Stage]:
+    """Stages that PATCH changed endpoint fields in place, then publish (with --publish) jobs flagged for it."""
+
+    def update(job: _DeployJob) -> bool:
+        slug = slugify(args.slug_template.format(name=job.name))
+        fields = ", ".join(sorted(job.changes))
+        if args.dry_run:
+            job.lines.append(f"    [DRY RUN] Would update endpoint {slug}: {fields}")
+            return job.publish
+        ok, msg = client.update_endpoint(slug, job.changes)
+        if not ok:
+            job.lines.append(f"    Update failed: {msg}")
+            job.failed = True
+            return False
+        job.lines.append(f"    Updated endpoint {slug}: {fields}")
+        return job.publish
+
+    stages = [Stage("update", update, args.workers)]
+    if args.publish:
+        # Named apart from the main pipeline's publish stage so the summary tells them apart;
+        # --stage-workers/--stage-rates "publish" settings apply to both
+        workers = _parse_stage_options(args.stage_workers, int)
+        rates = _parse_stage_options(args.stage_rates, float)
+        stages.append(Stage(
+            "update-publish", _publish_handler(client, args),
+            workers.get("publish", args.workers), rates.get("publish", 0.0),
+        ))
+    return stages
+
+
+def _make_plan(
+    client: SyftClient, args, datasets: list[DatasetInfo], file_types: dict[str, list[str]], descriptions: dict
+) -> Plan:
+    """Fetch live state once (two list calls) and diff it against the source tree."""
+    desired = [
+        (
+            dataset.name,
+            # Only the dataset name is diffed, so file types needn't be detected yet
+            _dataset_payload(args, dataset.name, file_types.get(dataset.name)),
+            _endpoint_payload(args, dataset.name, _known_description(dataset, descriptions, args.generate_missing)),
+        )
+        for dataset in datasets
+    ]
+    return build_plan(
+        desired,
+        client.list_datasets(),
+        client.list_endpoints(),
+        needs_publish=_needs_publish if args.publish else None,
+    )
+
+
+def _print_plan(plan: Plan, show_orphans: bool):
+    for item in plan.create:
+        target = "endpoint" if item.dataset_id else "dataset + endpoint"
+        print(f"  + {item.name}: create {target}")
+    for item in plan.update:
+        publish = ", publish" if item.publish else ""
+        print(f"  ~ {item.name}: update {', '.join(sorted(item.changes))}{publish}")
+    for item in plan.publish_only:
+        print(f"  ^ {item.name}: publish")
+    if show_orphans:
+        for name in plan.orphan_datasets:
+            print(f"  ? dataset {name}: not in source tree")
+        for slug in plan.orphan_endpoints:
+            print(f"  ? endpoint {slug}: not in source tree")
+    print(f"\nPlan: {plan.summary()}")
+
+
 def cmd_deploy(client: SyftClient, args):
     print("=" * 60)
     print("DEPLOY DATASETS")
@@ -72,146 +388,184 @@ def cmd_deploy(client: SyftClient, args):
     print(f"API: {client.base_url}")
     print(f"Source: {args.source_dir}")
     print(f"Dry run: {args.dry_run}")
+    if args.plan or args.apply:
+        print(f"Mode: {'plan' if args.plan else 'apply'}")
     if args.generate_missing:
         print("Generate missing descriptions: enabled")
     print()
 
-    if not args.dry_run:
+    # Plan/apply verify connectivity with the two list calls they need anyway
+    if not args.dry_run and not (args.plan or args.apply):
         if not client.check_connection():
             print("Error: Cannot connect to API")
             return 1
         print("API connected\n")
 
-    # Resolve file types
-    if args.file_types:
-        file_types = [t.strip() for t in args.file_types.split(",")]
-    else:
-        file_types = detect_file_types(args.source_dir)
-        if file_types:
-            print(f"Auto-detected file types: {', '.join(file_types)}")
-        else:
-            print("Warning: No file types detected, using ['.pdf', '.json']")
-            file_types = [".pdf", ".json"]
-
-    # Load descriptions JSON if provided (used as fallback)
-    descriptions = {}
-    if args.descriptions:
-        with open(args.descriptions) as f:
-            descriptions = json.load(f)
-        print(f"Loaded {len(descriptions)} descriptions from JSON")
-
-    # Load progress
-    progress_file = Path(args.progress_file)
-    progress = load_progress(progress_file) if args.resume else {"deployed": [], "updated": [], "failed": []}
-
     # Discover datasets
-    datasets = discover_datasets(args.source_dir)
+    datasets = load_datasets(args.source_dir, args.index)
     print(f"Found {len(datasets)} datasets")
 
     if args.limit > 0:
         datasets = datasets[: args.limit]
         print(f"Limited to {args.limit}")
-    print()
-
-    success, skipped, failed = 0, 0, 0
 
-    for i, name in enumerate(datasets, 1):
-        display_name = name.replace("-", " ").title()
-        print(f"[{i}/{len(datasets)}] {name}")
-
-        if args.resume and name in progress["deployed"]:
-            print("    Skipped (already deployed)")
-            skipped += 1
-            continue
+    # Resolve file types: --file-types for all, else each dataset's own
+    # extensions. Histograms from the index are free; the rest are walked
+    # below, once it is known which datasets will actually be deployed.
+    if args.file_types:
+        types = [t.strip() for t in args.file_types.split(",")]
+        file_types = {dataset.name: types for dataset in datasets}
+    else:
+        file_types = {dataset.name: _histogram_types(dataset) for dataset in datasets if dataset.extensions is not None}
 
-        dataset_dir = args.source_dir / name
+    def detect_file_types(selected: list[DatasetInfo]):
+        todo = [dataset for dataset in selected if dataset.name not in file_types]
+        if todo:
+            file_types.update(_detect_file_types(todo, args.scan_workers))
 
-        # Resolve description
-        description = _resolve_description(
-            dataset_dir, name, descriptions, args.generate_missing, args.dry_run
-        )
-        if description:
-            source = DESCRIPTION_FILENAME if (dataset_dir / DESCRIPTION_FILENAME).exists() else "JSON"
-            print(f"    Description: {len(description)} chars (from {source})")
-
-        # Build dataset payload
-        dataset_name = slugify(args.name_template.format(name=name))
-        container_path = f"{args.container_dir}/{name}"
-
-        dataset_payload = {
-            "name": dataset_name,
-            "dtype": "local_file",
-            "configuration": {
-                "filePaths": [{"path": container_path, "description": name}],
-                "ingestFileTypeOptions": file_types,
-            },
-            "summary": args.summary_template.format(name=display_name),
-            "tags": args.tags,
-        }
+    # Load descriptions JSON if provided (used as fallback)
+    descriptions = {}
+    if args.descriptions:
+        try:
+            descriptions = load_descriptions(args.descriptions)
+        except (OSError, ValueError) as e:
+            print(f"Error: Cannot load descriptions: {e}")
+            return 1
+        print(f"Loaded {len(descriptions)} descriptions from {args.descriptions}")
 
-        if args.dry_run:
-            print(f"    [DRY RUN] Would create dataset: {dataset_name}")
-        else:
-            ok, result = client.create_dataset(dataset_payload)
-            if ok:
-                print(f"    Dataset: {dataset_name}")
-            else:
-                print(f"    Dataset failed: {result}")
-                progress["failed"].append(name)
-                save_progress(progress_file, progress)
-                failed += 1
-                continue
-            time.sleep(args.delay)
-
-        dataset_id = None
-        if not args.dry_run:
-            dataset_id = result.get("id") if isinstance(result, dict) else None
+    print_lock = threading.Lock()
+    llm_cache = open_llm_cache(args) if args.generate_missing else None
 
-        # Build endpoint payload
-        endpoint_slug = slugify(args.slug_template.format(name=name))
+    try:
+        stages = _build_stages(client, args, file_types, descriptions, llm_cache)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
 
-        endpoint_payload = {
-            "name": endpoint_slug,
-            "slug": endpoint_slug,
-            "description": description,
-            "summary": args.summary_template.format(name=display_name),
-            "response_type": args.response_type,
-            "published": args.publish,
-            "tags": args.tags,
-        }
+    print()
 
-        if dataset_id:
-            endpoint_payload["dataset_id"] = dataset_id
+    plan = None
+    if args.plan or args.apply:
+        try:
+            plan = _make_plan(client, args, datasets, file_types, descriptions)
+        except Exception as e:
+            print(f"Error fetching live state: {e}")
+            return 1
+        # With --limit the tree is only partly considered, so orphans would be noise
+        _print_plan(plan, show_orphans=args.limit == 0)
+        if args.plan:
+            return 0
+        print()
 
-        if args.dry_run:
-            print(f"    [DRY RUN] Would create endpoint: {endpoint_slug}")
-            if args.publish:
-                print(f"    [DRY RUN] Would publish to marketplace: {endpoint_slug}")
-        else:
-            ok, result = client.create_endpoint(endpoint_payload)
-            if ok:
-                print(f"    Endpoint: {endpoint_slug}")
+    # Load progress
+    progress = open_progress(args.progress_file, read_only=args.dry_run)
+    progress_lock = threading.Lock()
+
+    def record(status: str, name: str, fingerprints: dict | None = None, keep_dataset: bool = False):
+        with progress_lock:
+            if fingerprints:
+                stored = progress.fingerprints(name)
+                if stored:
+                    if keep_dataset:
+                        fingerprints["dataset"] = stored["dataset"]
+                    fingerprints["endpoint"] = {**stored["endpoint"], **fingerprints["endpoint"]}
+            progress.mark("deploy", name, status, fingerprints)
+
+    counts = {"success": 0, "skipped": 0, "failed": 0}
+
+    def on_done(job: _DeployJob, error):
+        if error is not None:
+            job.lines.append(f"    Error: {error}")
+            job.failed = True
+        if not args.dry_run:
+            if job.failed:
+                record("failed", job.name)
             else:
-                print(f"    Endpoint failed: {result}")
-                progress["failed"].append(name)
-                save_progress(progress_file, progress)
-                failed += 1
-                continue
-            time.sleep(args.delay)
-
-            # Actually publish to marketplace(s) if --publish was set
-            if args.publish:
-                pub_ok, pub_msg = client.publish_endpoint(endpoint_slug)
-                if pub_ok:
-                    print(f"    Published to marketplace")
+                # An endpoint PATCH doesn't apply dataset config changes, so PATCH-only jobs keep the stored dataset hash
+                record("deployed", job.name, _payload_fingerprints(
+                    _dataset_payload(args, job.name, file_types.get(job.name)),
+                    _endpoint_payload(args, job.name, job.description),
+                ), keep_dataset=bool(job.changes))
+        with print_lock:
+            counts["failed" if job.failed else "success"] += 1
+            # Each dataset's lines are printed as one block when it finishes
+            print("\n".join(job.lines))
+
+    def needs_llm(dataset: DatasetInfo) -> bool:
+        return args.generate_missing and dataset.name not in descriptions and not dataset.has_description
+
+    try:
+        pipeline = Pipeline(stages, on_done)
+        pipeline.start()
+        update_pipeline = Pipeline(_update_stages(client, args), on_done)
+        update_pipeline.start()
+        if plan is not None:
+            by_name = {dataset.name: dataset for dataset in datasets}
+            actions = plan.create + plan.update + plan.publish_only
+            detect_file_types([by_name[item.name] for item in actions])
+            for i, item in enumerate(actions, 1):
+                job = _DeployJob(i, by_name[item.name], f"[{i}/{len(actions)}] {item.name}")
+                job.description = item.endpoint_payload["description"]
+                job.dataset_id = item.dataset_id
+                if item.action == "update":
+                    job.changes = item.changes
+                    job.publish = item.publish
+                    update_pipeline.submit(job)
+                elif item.action == "noop":
+                    pipeline.submit(job, "publish")
+                elif job.description is None and needs_llm(job.dataset):
+                    pipeline.submit(job, "describe")
                 else:
-                    print(f"    Publish to marketplace failed: {pub_msg}")
-                time.sleep(args.delay)
-
-        success += 1
-        if not args.dry_run:
-            progress["deployed"].append(name)
-            save_progress(progress_file, progress)
+                    # Existing dataset but no endpoint: start at the endpoint stage
+                    pipeline.submit(job, "endpoint" if item.dataset_id else "dataset")
+            counts["skipped"] = len(plan.noop) - len(plan.publish_only)
+        else:
+            detect_file_types([
+                dataset for dataset in datasets
+                if not (args.resume and progress.status("deploy", dataset.name) == "deployed")
+            ])
+            for i, dataset in enumerate(datasets, 1):
+                name = dataset.name
+                header = f"[{i}/{len(datasets)}] {name}"
+                if args.resume and progress.status("deploy", name) == "deployed":
+                    stored = progress.fingerprints(name)
+                    reason = "already deployed"
+                    if stored:
+                        description = _known_description(dataset, descriptions, args.generate_missing)
+                        types = file_types.get(name)
+                        dataset_changed, changes = _fingerprint_changes(
+                            stored,
+                            _dataset_payload(args, name, types) if types is not None else None,
+                            _endpoint_payload(args, name, description),
+                        )
+                        if changes:
+                            # PATCH in place; recreating would force a full re-ingest
+                            job = _DeployJob(i, dataset, header)
+                            job.description = description
+                            job.changes = changes
+                            if dataset_changed:
+                                job.lines.append("    Dataset config changed; not recreated (delete it to recreate)")
+                            update_pipeline.submit(job)
+                            continue
+                        reason = "unchanged"
+                        if dataset_changed:
+                            reason = "dataset config changed; delete it to recreate"
+                    with print_lock:
+                        print(f"{header}\n    Skipped ({reason})")
+                        counts["skipped"] += 1
+                    continue
+
+                job = _DeployJob(i, dataset, header)
+                pipeline.submit(job, "describe" if needs_llm(dataset) else "dataset")
+        update_pipeline.join()
+        pipeline.join()
+    finally:
+        progress.close()
+        if llm_cache:
+            llm_cache.prune()
+    stages.extend(update_pipeline.stages.values())
+
+    success, skipped, failed = counts["success"], counts["skipped"], counts["failed"]
 
     print("\n" + "=" * 60)
     print("SUMMARY")
@@ -219,5 +573,13 @@ def cmd_deploy(client: SyftClient, args):
     print(f"Success:  {success}")
     print(f"Skipped:  {skipped}")
     print(f"Failed:   {failed}")
+    if not args.dry_run:
+        print(f"Rate:     {client.rate_limiter.summary()}")
+        print(f"Retries:  {client.retry_budget.summary()}")
+    if llm_cache:
+        print(f"Cache:    {llm_cache.summary()}")
+    print("\nStages:")
+    for stage in stages:
+        print(f"  {stage.summary()}")
 
     return 0 if failed == 0 else 1
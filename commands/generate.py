@@ -2,14 +2,26 @@
 
 import os
 import json
+import random
+import threading
 import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
+from typing import Optional
 
 import requests
 
-from utils import discover_datasets
+from descriptions_store import DescriptionLog, compact_descriptions, is_jsonl, load_descriptions, write_descriptions_json
+from llm_cache import LLMCache, open_llm_cache
+from hedging import HedgePolicy
+from llm_metrics import LLMMetrics
+from ratelimit import AdaptiveRateLimiter, UsageLimiter
+from source_index import load_datasets
+from utils import DESCRIPTION_FILENAME, METADATA_SUFFIXES, DatasetInfo, iter_json_items
 
-OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+# Any OpenAI-compatible chat-completions API works, e.g. the local stub in stubs/openrouter.py
+DEFAULT_LLM_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
 
 DEFAULT_SYSTEM_PROMPT = """You are an expert who writes clear, authoritative descriptions of datasets.
 
@@ -34,21 +46,65 @@ DEFAULT_USER_PROMPT_TEMPLATE = """Generate a comprehensive description for this
 Generate the description following the structure provided. The dataset is named "{name}". Make the description detailed and specific to this dataset's content area."""
 
 
-DESCRIPTION_FILENAME = "journal_description.md"
-
-
-def load_metadata(dataset_dir: Path) -> list[dict]:
-    """Load metadata from the first JSON file found in a dataset directory."""
-    json_files = list(dataset_dir.glob("*.json"))
-    if not json_files:
+# Metadata items shown to the LLM per dataset (generate --sample-count)
+DEFAULT_SAMPLE_COUNT = 5
+
+# Rough completion size, charged against --tpm until the response reports usage
+COMPLETION_TOKEN_ESTIMATE = 1024
+
+
+def _metadata_files(dataset_dir: Path) -> list[Path]:
+    # One directory scan; sorted so a seeded sample is reproducible
+    with os.scandir(dataset_dir) as entries:
+        names = sorted(e.name for e in entries if e.name.endswith(METADATA_SUFFIXES) and e.is_file())
+    return [dataset_dir / name for name in names]
+
+
+def sample_metadata(files: list[Path], count: int, rng: random.Random) -> list[dict]:
+    """Uniformly sample count items across all files in one streaming pass.
+
+    Reservoir sampling (Algorithm R): memory holds count items, time is
+    linear in the total number of items. Sampled items keep file order.
+    """
+    reservoir: list[tuple[int, dict]] = []
+    seen = 0
+    for path in files:
+        for item in iter_json_items(path):
+            if seen < count:
+                reservoir.append((seen, item))
+            else:
+                j = rng.randrange(seen + 1)
+                if j < count:
+                    reservoir[j] = (seen, item)
+            seen += 1
+    return [item for _, item in sorted(reservoir, key=lambda pair: pair[0])]
+
+
+def load_metadata(
+    dataset: DatasetInfo | Path, limit: int | None = None, sampling: str = "first", seed: int = 0
+) -> list[dict]:
+    """Load up to limit metadata items from a dataset (a scanned DatasetInfo or a directory).
+
+    "first" streams the first JSON file (or JSONL file if there is no JSON
+    file) and stops after limit items, so memory and time depend on the
+    sample size, not the file size. "reservoir" draws a uniform sample of
+    limit items across every JSON/JSONL file, seeded by seed and the
+    dataset name so reruns pick the same items.
+    """
+    if isinstance(dataset, DatasetInfo):
+        files = dataset.metadata_paths
+    else:
+        files = _metadata_files(dataset)
+    if not files:
         return []
-    with open(json_files[0]) as f:
-        data = json.load(f)
-    return data if isinstance(data, list) else [data]
+    if sampling == "reservoir" and limit:
+        return sample_metadata(files, limit, random.Random(f"{seed}:{dataset.name}"))
+    json_files = [f for f in files if f.suffix == ".json"] or files
+    return list(iter_json_items(json_files[0], limit))
 
 
 def format_samples(
-    items: list[dict], title_field: str = "title", abstract_field: str = "abstract", count: int = 5
+    items: list[dict], title_field: str = "title", abstract_field: str = "abstract", count: int = DEFAULT_SAMPLE_COUNT
 ) -> str:
     """Format metadata items into sample text for the prompt."""
     samples = []
@@ -62,17 +118,98 @@ def format_samples(
     return "\n".join(samples)
 
 
-def generate_one(
-    name: str,
-    samples_text: str,
+BATCH_INSTRUCTIONS = """You will be given {count} datasets, separated by lines of dashes. Write one description per dataset, following the instructions for each.
+
+Respond with only a JSON object that maps each dataset name, exactly as given, to its description as a Markdown string. Do not wrap it in code fences."""
+
+
+class StreamStalled(Exception):
+    """A streamed completion sent nothing for longer than the inactivity timeout."""
+
+
+class RequestCancelled(Exception):
+    """A hedged attempt was cancelled because the other attempt answered first."""
+
+    def __init__(self, received: str = ""):
+        super().__init__("cancelled")
+        self.received = received
+
+
+def _read_sse(
+    response, start: float, on_delta=None, cancel: Optional[threading.Event] = None
+) -> tuple[str, Optional[dict], Optional[float]]:
+    """Consume an SSE chat-completion stream; returns (content, usage, time to first token).
+
+    on_delta, if given, is called with each content fragment as it arrives.
+    If cancel is set, reading stops at the next line with RequestCancelled.
+    """
+    parts = []
+    usage = None
+    ttft = None
+    response.encoding = "utf-8"
+    try:
+        # chunk_size=None yields data as it arrives instead of waiting for a full buffer
+        for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+            # Blank lines separate events; ":" lines are keep-alive comments
+            if cancel is not None and cancel.is_set():
+                raise RequestCancelled("".join(parts))
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            chunk = json.loads(data)
+            if "error" in chunk:
+                raise ValueError(f"stream error: {chunk['error'].get('message', chunk['error'])}")
+            usage = chunk.get("usage") or usage
+            for choice in chunk.get("choices") or []:
+                delta = (choice.get("delta") or {}).get("content")
+                if delta:
+                    if ttft is None:
+                        ttft = time.monotonic() - start
+                    parts.append(delta)
+                    if on_delta:
+                        on_delta(delta)
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+        # requests reports a read timeout mid-stream as a ConnectionError
+        if "timed out" in str(e).lower():
+            raise StreamStalled() from e
+        raise
+    return "".join(parts), usage, ttft
+
+
+def _chat_completion(
     system_prompt: str,
-    user_prompt_template: str,
+    user_prompt: str,
     model: str,
     api_key: str,
+    rate_limiter: Optional[AdaptiveRateLimiter] = None,
+    log=print,
+    usage_limiter: Optional[UsageLimiter] = None,
+    completion_estimate: int = COMPLETION_TOKEN_ESTIMATE,
+    timeout: float = 60,
+    base_url: str = DEFAULT_LLM_BASE_URL,
+    stream: bool = False,
+    idle_timeout: float = 30,
+    on_delta=None,
+    metrics: Optional[LLMMetrics] = None,
+    name: str = "",
+    cancel: Optional[threading.Event] = None,
+    info: Optional[dict] = None,
+    batch: bool = False,
 ) -> str | None:
-    """Call OpenRouter API to generate a single description."""
-    user_prompt = user_prompt_template.format(name=name, samples=samples_text)
-
+    """POST one chat completion to OpenRouter; returns the message content or None.
+
+    With stream, the reply is read as server-sent events: on_delta sees each
+    fragment as it arrives, and the request is aborted once the stream is
+    silent for idle_timeout seconds (there is no total timeout). Otherwise
+    the whole reply must arrive within timeout. metrics, if given, records
+    time to first token, total latency and completion tokens per request.
+    cancel stops a stream early (see hedging). info, if given, receives the
+    tokens the request cost ("tokens"), from usage or estimated. batch marks
+    a multi-dataset request, which is never hedged and whose metrics are
+    kept apart.
+    """
     payload = {
         "model": model,
         "messages": [
@@ -80,6 +217,10 @@ def generate_one(
             {"role": "user", "content": user_prompt},
         ],
     }
+    if stream:
+        # Ask for the usage totals in the final chunk
+        payload["stream"] = True
+        payload["stream_options"] = {"include_usage": True}
 
     headers = {
         "Authorization": f"Bearer {api_key}",
@@ -88,18 +229,336 @@ def generate_one(
         "X-Title": "Dataset Description Generator",
     }
 
+    # ~4 characters per token is close enough for budgeting
+    estimate = (len(system_prompt) + len(user_prompt)) // 4 + completion_estimate
+    if usage_limiter:
+        usage_limiter.acquire(estimate)
+    if rate_limiter:
+        rate_limiter.acquire()
+    start = time.monotonic()
+    response = None
     try:
         response = requests.post(
-            OPENROUTER_URL, headers=headers, json=payload, timeout=60
+            f"{base_url.rstrip('/')}/chat/completions", headers=headers, json=payload,
+            # For streams the read timeout applies per socket read, i.e. it is an inactivity timeout
+            timeout=(10, idle_timeout) if stream else timeout, stream=stream,
         )
-        if response.status_code == 200:
-            return response.json()["choices"][0]["message"]["content"]
+        if rate_limiter:
+            rate_limiter.record(
+                response.status_code, time.monotonic() - start, response.headers.get("Retry-After")
+            )
+        if response.status_code != 200:
+            log(f"    API error {response.status_code}: {response.text[:200]}")
+            return None
+
+        # A server may ignore "stream" and answer with a plain JSON body
+        if stream and response.headers.get("Content-Type", "").startswith("text/event-stream"):
+            content, usage, ttft = _read_sse(response, start, on_delta, cancel)
         else:
-            print(f"    API error {response.status_code}: {response.text[:200]}")
+            data = response.json()
+            content, usage, ttft = data["choices"][0]["message"]["content"], data.get("usage"), None
+        latency = time.monotonic() - start
+        if not content:
+            log("    Empty completion")
             return None
+        usage = usage or {}
+        if info is not None:
+            info["tokens"] = usage.get("total_tokens") or estimate
+        if usage_limiter:
+            usage_limiter.settle(estimate, usage.get("total_tokens"))
+        if metrics:
+            completion_tokens = usage.get("completion_tokens") or len(content) // 4
+            ttft = ttft if ttft is not None else latency
+            metrics.record(model, ttft, latency, completion_tokens, stream, name, batch)
+            rate = f", {completion_tokens / (latency - ttft):.0f} tok/s" if latency > ttft else ""
+            log(f"    {model}: TTFT {ttft:.2f}s{rate}, {latency:.2f}s total")
+        return content
+    except RequestCancelled as e:
+        used = (len(system_prompt) + len(user_prompt) + len(e.received)) // 4
+        if info is not None:
+            info["tokens"] = used
+        if usage_limiter:
+            usage_limiter.settle(estimate, used)
+        return None
+    except StreamStalled:
+        if metrics:
+            metrics.record_abort()
+        log(f"    Stream stalled for {idle_timeout:g}s, aborted")
+        return None
     except Exception as e:
-        print(f"    Request failed: {e}")
+        if rate_limiter and response is None:
+            rate_limiter.record(None, time.monotonic() - start)
+        log(f"    Request failed: {e}")
         return None
+    finally:
+        if response is not None:
+            response.close()
+
+
+def _completion(
+    system_prompt: str,
+    user_prompt: str,
+    model: str,
+    api_key: str,
+    rate_limiter: Optional[AdaptiveRateLimiter] = None,
+    log=print,
+    usage_limiter: Optional[UsageLimiter] = None,
+    hedge: Optional[HedgePolicy] = None,
+    on_delta=None,
+    **options,
+) -> str | None:
+    """_chat_completion, hedged against hedge.model when a HedgePolicy is given.
+
+    Only streamed single-dataset requests are hedged: a stream can be
+    cancelled between chunks, while a plain or batch request would keep
+    running (and billing) after losing. Only the primary attempt feeds
+    on_delta, so a partial file never mixes two models' output.
+    """
+    if hedge is None or hedge.model == model or not options.get("stream") or options.get("batch"):
+        return _chat_completion(
+            system_prompt, user_prompt, model, api_key, rate_limiter, log, usage_limiter,
+            on_delta=on_delta, **options,
+        )
+
+    def attempt(attempt_model: str, deltas):
+        def call(cancel: threading.Event) -> str | None:
+            info = {}
+            content = _chat_completion(
+                system_prompt, user_prompt, attempt_model, api_key, rate_limiter, log, usage_limiter,
+                on_delta=deltas, cancel=cancel, info=info, **options,
+            )
+            # The other attempt won; whatever this one used was the price of hedging
+            if cancel.is_set():
+                hedge.add_waste(info.get("tokens", 0))
+            return content
+        return call
+
+    delay = hedge.delay(model)
+    content, winner = hedge.run(
+        attempt(model, on_delta), attempt(hedge.model, None), delay,
+        on_hedge=lambda: log(f"    No answer after {delay:.1f}s, hedging with {hedge.model}"),
+    )
+    if content and winner == "backup":
+        log(f"    Hedge won: {hedge.model} answered first")
+    return content
+
+
+def generate_one(
+    name: str,
+    samples_text: str,
+    system_prompt: str,
+    user_prompt_template: str,
+    model: str,
+    api_key: str,
+    rate_limiter: Optional[AdaptiveRateLimiter] = None,
+    log=print,
+    usage_limiter: Optional[UsageLimiter] = None,
+    cache: Optional[LLMCache] = None,
+    base_url: str = DEFAULT_LLM_BASE_URL,
+    **request_options,
+) -> str | None:
+    """Call OpenRouter API to generate a single description.
+
+    If rate_limiter is given, the call waits for it and reports the outcome back.
+    If usage_limiter is given, the call also waits for its RPM/TPM budget.
+    If cache is given, an identical earlier prompt is answered from it without
+    an API call, and new responses are stored in it. request_options (stream,
+    idle_timeout, on_delta, metrics, hedge) are passed to _completion.
+    """
+    cache_key = None
+    if cache:
+        cache_key = cache.key(model, system_prompt, user_prompt_template, name, samples_text)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            log("    Description from LLM cache")
+            return cached
+
+    user_prompt = user_prompt_template.format(name=name, samples=samples_text)
+    content = _completion(
+        system_prompt, user_prompt, model, api_key, rate_limiter, log, usage_limiter,
+        base_url=base_url, name=name, **request_options,
+    )
+    if cache and content:
+        cache.put(cache_key, content, model)
+    return content
+
+
+def _parse_batch_response(content: str, names: list[str]) -> dict:
+    """Extract {name: description} for the requested names from a batch reply.
+
+    Accepts a JSON object keyed by name (optionally inside code fences or
+    surrounding text) or a list of {"name", "description"} objects.
+    Names missing from the reply, or not strings, are left out.
+    """
+    start = min((i for i in (content.find("{"), content.find("[")) if i != -1), default=-1)
+    end = max(content.rfind("}"), content.rfind("]"))
+    if start == -1 or end < start:
+        return {}
+    try:
+        data = json.loads(content[start : end + 1])
+    except ValueError:
+        return {}
+    if isinstance(data, list):
+        data = {d.get("name"): d.get("description") for d in data if isinstance(d, dict)}
+    if not isinstance(data, dict):
+        return {}
+    return {name: data[name].strip() for name in names if isinstance(data.get(name), str) and data[name].strip()}
+
+
+def generate_batch(
+    batch: list[tuple[str, str]],
+    system_prompt: str,
+    user_prompt_template: str,
+    model: str,
+    api_key: str,
+    rate_limiter: Optional[AdaptiveRateLimiter] = None,
+    log=print,
+    usage_limiter: Optional[UsageLimiter] = None,
+    cache: Optional[LLMCache] = None,
+    base_url: str = DEFAULT_LLM_BASE_URL,
+    **request_options,
+) -> dict:
+    """Generate descriptions for several (name, samples_text) pairs in one request.
+
+    The system prompt is sent once, and the model answers with a JSON object
+    keyed by dataset name. Returns the descriptions it could parse; callers
+    fall back to generate_one for the rest. Parsed descriptions are cached
+    under the same keys generate_one uses.
+    """
+    sections = [user_prompt_template.format(name=name, samples=samples) for name, samples in batch]
+    user_prompt = (
+        BATCH_INSTRUCTIONS.format(count=len(batch))
+        + "\n\n"
+        + "\n\n----------\n\n".join(sections)
+    )
+    content = _completion(
+        system_prompt, user_prompt, model, api_key, rate_limiter, log, usage_limiter,
+        completion_estimate=COMPLETION_TOKEN_ESTIMATE * len(batch),
+        timeout=60 + 30 * len(batch),
+        base_url=base_url,
+        batch=True,
+        name=",".join(name for name, _ in batch),
+        **request_options,
+    )
+    if not content:
+        return {}
+    results = _parse_batch_response(content, [name for name, _ in batch])
+    if cache:
+        samples_by_name = dict(batch)
+        for name, description in results.items():
+            cache.put(cache.key(model, system_prompt, user_prompt_template, name, samples_by_name[name]), description, model)
+    return results
+
+
+def _write_atomic(path: Path, text: str):
+    # Write to a sibling temp file and rename, so Ctrl-C never leaves a torn file
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def _partial_path(source_dir: Path, name: str) -> Path:
+    return source_dir / name / f"{DESCRIPTION_FILENAME}.partial"
+
+
+def _generate_for(
+    batch: list[tuple[int, DatasetInfo]], args, system_prompt: str, user_prompt_template: str,
+    api_key: str, rate_limiter, usage_limiter, llm_cache, stop: threading.Event, request_options: dict,
+) -> tuple[list[tuple[int, str, str, Optional[str], list[str]]], dict]:
+    """Worker: build the prompts for a batch of datasets and generate their descriptions.
+
+    batch holds (index, DatasetInfo) pairs. Returns ([(index, name, status,
+    description, log lines)], batch stats);
+    status is "success", "failed" or "cancelled". A batch of one is a plain
+    generate_one call. Datasets a batch reply doesn't cover fall back to
+    generate_one. request_options are passed to every LLM request. An error
+    in one dataset (e.g. a malformed metadata file) fails only that dataset.
+    """
+    if stop.is_set():
+        return [(i, dataset.name, "cancelled", None, []) for i, dataset in batch], {}
+
+    results = {}
+    prompts = []
+    for i, dataset in batch:
+        name = dataset.name
+        lines = []
+        results[name] = [i, name, "failed", None, lines]
+        try:
+            items = load_metadata(dataset, args.sample_count, args.sampling, args.sample_seed)
+            if not items:
+                lines.append("    No metadata found, skipping")
+                continue
+            lines.append(f"    Sampled {len(items)} items")
+            samples_text = format_samples(
+                items, args.metadata_field, args.abstract_field, args.sample_count
+            )
+        except Exception as e:
+            lines.append(f"    Error reading metadata: {e}")
+            continue
+        if args.dry_run:
+            lines.append(f"    [DRY RUN] Would generate description")
+            results[name][2] = "success"
+            continue
+        if llm_cache:
+            cached = llm_cache.get(llm_cache.key(args.model, system_prompt, user_prompt_template, name, samples_text))
+            if cached is not None:
+                lines.append("    Description from LLM cache")
+                results[name][2:4] = ["success", cached]
+                continue
+        prompts.append((name, samples_text))
+
+    stats = {}
+    if len(prompts) > 1:
+        log = []
+        generated = generate_batch(
+            prompts, system_prompt, user_prompt_template, args.model, api_key,
+            rate_limiter, log=log.append, usage_limiter=usage_limiter, cache=llm_cache,
+            base_url=args.llm_base_url, **request_options,
+        )
+        stats = {"batches": 1, "batched": len(generated), "fallbacks": len(prompts) - len(generated)}
+        for name, description in generated.items():
+            results[name][2:4] = ["success", description]
+            results[name][4].extend(log)
+            results[name][4].append(f"    Generated in a batch of {len(prompts)}")
+        prompts = [(name, samples) for name, samples in prompts if name not in generated]
+        for name, _ in prompts:
+            results[name][4].extend(log)
+            results[name][4].append("    Not in batch reply, falling back to a single request")
+
+    for name, samples_text in prompts:
+        lines = results[name][4]
+        options = dict(request_options)
+        partial_file = None
+        try:
+            if options.get("stream"):
+                # Streamed text lands here as it arrives. It is kept after a failed or
+                # cancelled stream to show how far it got, and removed once the .md is written
+                partial_file = open(_partial_path(args.source_dir, name), "w")
+                options["on_delta"] = lambda text, f=partial_file: (f.write(text), f.flush())
+            # The cache was already checked above; only store the new response
+            description = generate_one(
+                name, samples_text, system_prompt, user_prompt_template, args.model, api_key,
+                rate_limiter, log=lines.append, usage_limiter=usage_limiter, base_url=args.llm_base_url,
+                **options,
+            )
+        except Exception as e:
+            lines.append(f"    Error: {e}")
+            description = None
+        finally:
+            if partial_file:
+                partial_file.close()
+        if description:
+            results[name][2:4] = ["success", description]
+            if llm_cache:
+                llm_cache.put(llm_cache.key(args.model, system_prompt, user_prompt_template, name, samples_text), description, args.model)
+        else:
+            lines.append("    Failed to generate")
+
+    for _, _, _, description, lines in results.values():
+        if description:
+            lines.append(f"    Generated ({len(description)} chars)")
+    return [tuple(result) for result in results.values()], stats
 
 
 def cmd_generate(client, args):
@@ -120,9 +579,19 @@ def cmd_generate(client, args):
     print("GENERATE DESCRIPTIONS")
     print("=" * 60)
     print(f"Model: {args.model}")
+    if args.hedge_model:
+        print(f"Hedge model: {args.hedge_model} (after p{args.hedge_percentile:g} latency)")
+        if not args.stream:
+            print("Warning: only streamed requests are hedged; add --stream to enable hedging")
+    print(f"LLM API: {args.llm_base_url}")
     print(f"Source: {args.source_dir}")
     print(f"Output: {args.output}")
     print(f"Dry run: {args.dry_run}")
+    print(f"Concurrency: {args.concurrency}")
+    if args.stream:
+        print(f"Streaming: on (abort after {args.stream_idle_timeout:g}s without data)")
+    if args.batch_size > 1:
+        print(f"Batch size: {args.batch_size}")
     print()
 
     if not args.dry_run and not api_key:
@@ -134,11 +603,19 @@ def cmd_generate(client, args):
     output_path = Path(args.output)
     descriptions = {}
     if args.resume and output_path.exists():
-        with open(output_path) as f:
-            descriptions = json.load(f)
+        try:
+            descriptions = load_descriptions(output_path)
+        except ValueError as e:
+            print(f"Error: Cannot resume from {output_path}: {e}")
+            return 1
+
+    # A .jsonl output is an append-only log; a .json output is rewritten whole
+    description_log = None
+    if is_jsonl(output_path) and not args.dry_run:
+        description_log = DescriptionLog(output_path, truncate=not args.resume)
 
     # Discover datasets
-    datasets = discover_datasets(args.source_dir)
+    datasets = load_datasets(args.source_dir, args.index)
     print(f"Found {len(datasets)} datasets")
 
     if args.limit > 0:
@@ -146,55 +623,120 @@ def cmd_generate(client, args):
         print(f"Limited to {args.limit}")
     print()
 
-    success, skipped, failed = 0, 0, 0
-
-    for i, name in enumerate(datasets, 1):
-        print(f"[{i}/{len(datasets)}] {name}")
+    # --delay seeds the limiter; OpenRouter 429s and latency then steer the rate
+    rate_limiter = AdaptiveRateLimiter(rate=1 / args.delay if args.delay > 0 else 50.0, max_rate=50.0)
+    usage_limiter = UsageLimiter(rpm=args.rpm, tpm=args.tpm)
+    llm_cache = open_llm_cache(args)
+    metrics = LLMMetrics(args.llm_metrics)
+    hedge = None
+    if args.hedge_model:
+        hedge = HedgePolicy(
+            args.hedge_model, metrics, percentile=args.hedge_percentile,
+            min_samples=args.hedge_min_samples, initial_delay=args.hedge_after,
+        )
+    request_options = {
+        "stream": args.stream, "idle_timeout": args.stream_idle_timeout, "metrics": metrics, "hedge": hedge,
+    }
+    concurrency = max(1, args.concurrency)
+    batch_size = max(1, args.batch_size)
+    batch_stats = {"batches": 0, "batched": 0, "fallbacks": 0}
 
-        if args.resume and name in descriptions:
+    success, skipped, failed = 0, 0, 0
+    todo = deque()
+    for i, dataset in enumerate(datasets, 1):
+        if args.resume and dataset.name in descriptions:
+            print(f"[{i}/{len(datasets)}] {dataset.name}")
             print("    Already generated, skipping")
             skipped += 1
-            continue
-
-        # Load and format metadata samples
-        dataset_dir = args.source_dir / name
-        items = load_metadata(dataset_dir)
-        if not items:
-            print("    No metadata found, skipping")
-            failed += 1
-            continue
-
-        print(f"    Found {len(items)} items")
-        samples_text = format_samples(
-            items, args.metadata_field, args.abstract_field, args.sample_count
-        )
-
-        if args.dry_run:
-            print(f"    [DRY RUN] Would generate description")
-            success += 1
-            continue
-
-        description = generate_one(
-            name, samples_text, system_prompt, user_prompt_template, args.model, api_key
-        )
-
-        if description:
-            print(f"    Generated ({len(description)} chars)")
-            descriptions[name] = description
-            with open(output_path, "w") as f:
-                json.dump(descriptions, f, indent=2)
-            # Also write journal_description.md into dataset directory
-            md_path = dataset_dir / DESCRIPTION_FILENAME
-            with open(md_path, "w") as f:
-                f.write(description)
-            print(f"    Wrote {DESCRIPTION_FILENAME}")
-            success += 1
         else:
-            print("    Failed to generate")
-            failed += 1
-
-        if i < len(datasets):
-            time.sleep(args.delay)
+            todo.append((i, dataset))
+
+    # Workers only call the API; the --output file and the .md files are
+    # written here, one completed dataset at a time, so every finished
+    # description is on disk before the next one is reported.
+    stop = threading.Event()
+    pending = {}
+    # Completed (item, result) pairs not yet written; an entry leaves only
+    # once it is on disk, so a Ctrl-C mid-write can't lose it
+    ready = deque()
+    interrupted = False
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="generate")
+    try:
+        while todo or pending or ready:
+            try:
+                # Keep the queue short so Ctrl-C has little to cancel
+                while todo and not stop.is_set() and len(pending) < concurrency * 2:
+                    batch = [todo.popleft() for _ in range(min(batch_size, len(todo)))]
+                    future = executor.submit(
+                        _generate_for, batch, args, system_prompt,
+                        user_prompt_template, api_key, rate_limiter, usage_limiter, llm_cache, stop, request_options,
+                    )
+                    pending[future] = batch
+                if not pending and not ready:
+                    break
+
+                if not ready:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        results, stats = future.result()
+                        batch = pending.pop(future)
+                        ready.extend(zip(batch, results))
+                        for key, value in stats.items():
+                            batch_stats[key] += value
+
+                while ready:
+                    item, (i, name, status, description, lines) = ready[0]
+                    if status == "cancelled":
+                        todo.appendleft(item)
+                        ready.popleft()
+                        continue
+                    print(f"[{i}/{len(datasets)}] {name}")
+                    for line in lines:
+                        print(line)
+                    if status == "failed":
+                        failed += 1
+                        ready.popleft()
+                        continue
+                    if description:
+                        descriptions[name] = description
+                        if description_log:
+                            description_log.append(name, description)
+                        else:
+                            write_descriptions_json(output_path, descriptions)
+                        # Also write journal_description.md into dataset directory
+                        _write_atomic(args.source_dir / name / DESCRIPTION_FILENAME, description)
+                        _partial_path(args.source_dir, name).unlink(missing_ok=True)
+                        print(f"    Wrote {DESCRIPTION_FILENAME}")
+                    success += 1
+                    ready.popleft()
+            except KeyboardInterrupt:
+                if interrupted:
+                    raise
+                interrupted = True
+                stop.set()
+                for future in [f for f in pending if f.cancel()]:
+                    todo.extendleft(reversed(pending.pop(future)))
+                print(
+                    f"\nInterrupted: finishing {len(pending)} in-flight request(s) "
+                    f"(Ctrl-C again to abandon them)"
+                )
+    except KeyboardInterrupt:
+        print(f"\nAbandoned {len(pending)} in-flight request(s)")
+        for batch in pending.values():
+            todo.extend(batch)
+        # Finished but unwritten; with the LLM cache a rerun gets them back without a request
+        todo.extend(item for item, _ in ready)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        if description_log:
+            description_log.close()
+        metrics.close()
+        if llm_cache:
+            llm_cache.prune()
+
+    if args.compact_to and not args.dry_run:
+        count = compact_descriptions(output_path, args.compact_to) if output_path.exists() else 0
+        print(f"\nCompacted {count} descriptions into {args.compact_to}")
 
     print("\n" + "=" * 60)
     print("SUMMARY")
@@ -202,8 +744,25 @@ def cmd_generate(client, args):
     print(f"Success:  {success}")
     print(f"Skipped:  {skipped}")
     print(f"Failed:   {failed}")
+    if interrupted:
+        print(f"Not run:  {len(todo)} (interrupted; rerun with --resume)")
 
     if not args.dry_run:
+        print(f"Rate:     {rate_limiter.summary()}")
+        print(f"Usage:    {usage_limiter.summary()}")
+        if llm_cache:
+            print(f"Cache:    {llm_cache.summary()}")
+        for line in metrics.summary():
+            print(f"LLM:      {line}")
+        if hedge:
+            print(f"Hedges:   {hedge.summary()}")
+        if batch_stats["batches"]:
+            print(
+                f"Batches:  {batch_stats['batches']} requests, {batch_stats['batched']} descriptions, "
+                f"{batch_stats['fallbacks']} fell back to single requests"
+            )
         print(f"\nDescriptions saved to: {output_path}")
 
+    if interrupted:
+        return 130
     return 0 if failed == 0 else 1
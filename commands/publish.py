@@ -1,7 +1,5 @@
 """Publish unpublished endpoints to marketplaces."""
 
-import time
-
 from client import SyftClient
 
 
@@ -49,9 +47,11 @@ def cmd_publish(client: SyftClient, args):
                 else:
                     print(f"  [{i}/{len(unpublished)}] {slug}: Failed - {msg}")
                     failed += 1
-                time.sleep(args.delay)
 
         print(f"\nPublished: {success}, Failed: {failed}")
+        if not args.dry_run:
+            print(f"Rate: {client.rate_limiter.summary()}")
+            print(f"Retries: {client.retry_budget.summary()}")
 
     except Exception as e:
         print(f"Error: {e}")
@@ -1,11 +1,8 @@
-"""Update endpoint descriptions from a descriptions JSON file."""
-
-import json
-import time
-from pathlib import Path
+"""Update endpoint descriptions from a descriptions JSON or JSONL file."""
 
 from client import SyftClient
-from utils import load_progress, save_progress
+from descriptions_store import load_descriptions
+from progress_store import open_progress
 
 
 def cmd_update(client: SyftClient, args):
@@ -18,16 +15,17 @@ def cmd_update(client: SyftClient, args):
 
     # Load descriptions
     try:
-        with open(args.descriptions) as f:
-            descriptions = json.load(f)
+        descriptions = load_descriptions(args.descriptions)
     except FileNotFoundError:
         print(f"Error: Descriptions file not found: {args.descriptions}")
         return 1
+    except ValueError as e:
+        print(f"Error: Invalid descriptions file: {e}")
+        return 1
     print(f"Loaded {len(descriptions)} descriptions")
 
     # Load progress
-    progress_file = Path(args.progress_file)
-    progress = load_progress(progress_file) if args.resume else {"deployed": [], "updated": [], "failed": []}
+    progress = open_progress(args.progress_file, read_only=args.dry_run)
 
     try:
         endpoints = client.list_endpoints()
@@ -43,7 +41,7 @@ def cmd_update(client: SyftClient, args):
             slug = ep["slug"]
             print(f"[{i}/{len(endpoints)}] {slug}")
 
-            if args.resume and slug in progress["updated"]:
+            if args.resume and progress.status("update", slug) == "updated":
                 print("    Skipped (already updated)")
                 skipped += 1
                 continue
@@ -66,18 +64,22 @@ def cmd_update(client: SyftClient, args):
                 ok, msg = client.update_endpoint(slug, payload)
                 if ok:
                     print("    Updated")
-                    progress["updated"].append(slug)
-                    save_progress(progress_file, progress)
+                    progress.mark("update", slug, "updated")
                     success += 1
                 else:
                     print(f"    Failed: {msg}")
+                    progress.mark("update", slug, "failed")
                     failed += 1
-                time.sleep(args.delay)
 
         print(f"\nUpdated: {success}, Skipped: {skipped}, No description: {no_desc}, Failed: {failed}")
+        if not args.dry_run:
+            print(f"Rate: {client.rate_limiter.summary()}")
+            print(f"Retries: {client.retry_budget.summary()}")
 
     except Exception as e:
         print(f"Error: {e}")
         return 1
+    finally:
+        progress.close()
 
     return 0
@@ -0,0 +1,158 @@
+"""Descriptions files: the JSON map and the append-only JSON Lines log."""
+
+import json
+import os
+import time
+from pathlib import Path
+
+
+def is_jsonl(path: Path) -> bool:
+    return Path(path).suffix == ".jsonl"
+
+
+def _is_record(value) -> bool:
+    return isinstance(value, dict) and isinstance(value.get("name"), str) and isinstance(value.get("description"), str)
+
+
+def _is_map(value) -> bool:
+    return isinstance(value, dict) and all(isinstance(v, str) for v in value.values())
+
+
+def _invalid(path: Path, where: str, value) -> ValueError:
+    return ValueError(
+        f"{path}: {where} ({json.dumps(value)[:60]}) is not a {{name: description}} map "
+        f'of strings or a {{"name": ..., "description": ...}} record'
+    )
+
+
+def _load_jsonl(path: Path) -> dict:
+    descriptions = {}
+    with open(path, "rb") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A torn last line from an interrupted append is ignored;
+                # anything else is a corrupt file
+                if line.endswith(b"\n"):
+                    raise
+                break
+            if not _is_record(record):
+                raise _invalid(path, f"line {number}", record)
+            descriptions[record["name"]] = record["description"]
+    return descriptions
+
+
+def load_descriptions(path: Path) -> dict:
+    """Load a descriptions file into a {name: description} map.
+
+    Accepts the JSON map written by ``generate --output x.json`` and the
+    JSON Lines log written by ``generate --output x.jsonl``, where each
+    line is {"name": ..., "description": ...} and later lines win. JSONL
+    is read line by line without building an intermediate list, so resuming
+    from a large log is fast. Raises ValueError, naming the file, on
+    anything else.
+    """
+    path = Path(path)
+    if is_jsonl(path):
+        return _load_jsonl(path)
+    # A JSON map is one top-level value, so it is read whole; a list of
+    # {"name", "description"} records is accepted as well
+    with open(path, encoding="utf-8-sig") as f:
+        data = json.load(f)
+    descriptions = {}
+    if not isinstance(data, list):
+        if not _is_map(data):
+            raise _invalid(path, "the top-level value", data)
+        data = [data]
+    for index, value in enumerate(data):
+        if _is_record(value):
+            descriptions[value["name"]] = value["description"]
+        elif _is_map(value):
+            descriptions.update(value)
+        else:
+            raise _invalid(path, f"item {index}", value)
+    return descriptions
+
+
+class DescriptionLog:
+    """Append-only JSON Lines writer for generated descriptions.
+
+    Each append is one line, written straight to the OS, so a crashed
+    process loses nothing. fsync (durability against power loss) is batched:
+    every ``fsync_every`` appends or ``fsync_interval`` seconds, and on close.
+    Opening the log trims a torn last line left by an interrupted append.
+    """
+
+    def __init__(self, path: Path, truncate: bool = False, fsync_every: int = 20, fsync_interval: float = 5.0):
+        self.path = Path(path)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        if not truncate:
+            self._trim_torn_tail()
+        self._file = open(self.path, "w" if truncate else "a", encoding="utf-8")
+
+    def _trim_torn_tail(self):
+        try:
+            with open(self.path, "rb+") as f:
+                size = f.seek(0, os.SEEK_END)
+                if size == 0:
+                    return
+                # Walk back to the last newline; everything after it is partial
+                block = 4096
+                end = size
+                while end > 0:
+                    start = max(0, end - block)
+                    f.seek(start)
+                    chunk = f.read(end - start)
+                    newline = chunk.rfind(b"\n")
+                    if newline != -1:
+                        f.truncate(start + newline + 1)
+                        return
+                    end = start
+                f.truncate(0)
+        except FileNotFoundError:
+            pass
+
+    def append(self, name: str, description: str):
+        self._file.write(json.dumps({"name": name, "description": description}, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._pending += 1
+        if self._pending >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self):
+        if self._pending:
+            os.fsync(self._file.fileno())
+            self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        self.sync()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_descriptions_json(path: Path, descriptions: dict):
+    """Atomically write the {name: description} JSON map."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(descriptions, f, indent=2)
+    os.replace(tmp, path)
+
+
+def compact_descriptions(source: Path, target: Path) -> int:
+    """Collapse a descriptions log (last entry wins) into a JSON map; returns the entry count."""
+    descriptions = load_descriptions(source)
+    write_descriptions_json(target, descriptions)
+    return len(descriptions)
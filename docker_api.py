@@ -0,0 +1,264 @@
+"""Docker Engine API lookups over the local unix socket, with a docker CLI fallback."""
+
+import http.client
+import json
+import os
+import socket
+import stat
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+
+def _default_socket() -> str:
+    host = os.getenv("DOCKER_HOST", "")
+    if host.startswith("unix://"):
+        return host[len("unix://"):]
+    return "/var/run/docker.sock"
+
+
+DEFAULT_DOCKER_SOCKET = _default_socket()
+
+DEFAULT_KEY_CACHE = Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "syft-space-deploy" / "api-keys.json"
+
+API_KEY_ENV = "SYFT_ADMIN_API_KEY"
+
+
+class DockerError(Exception):
+    """The Docker Engine answered with an error status or an unreadable body."""
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+class DockerClient:
+    """Minimal Docker Engine API client over one keep-alive unix-socket connection."""
+
+    def __init__(self, socket_path: str = DEFAULT_DOCKER_SOCKET, timeout: float = 5.0):
+        self.socket_path = socket_path
+        self._conn = _UnixHTTPConnection(socket_path, timeout)
+
+    def get(self, path: str):
+        self._conn.request("GET", path, headers={"Host": "docker"})
+        response = self._conn.getresponse()
+        body = response.read()
+        if response.status != 200:
+            raise DockerError(f"GET {path}: HTTP {response.status}")
+        try:
+            return json.loads(body)
+        except ValueError as e:
+            raise DockerError(f"GET {path}: {e}") from e
+
+    def containers(self) -> list[dict]:
+        """Running containers, with their published ports (GET /containers/json)."""
+        return self.get("/containers/json")
+
+    def inspect(self, container_id: str) -> dict:
+        """Full container details, including env and start time (GET /containers/{id}/json)."""
+        return self.get(f"/containers/{container_id}/json")
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ContainerKey:
+    """The Syft Space container publishing a port, and the admin API key in its env."""
+
+    __slots__ = ("container_id", "name", "started_at", "api_key")
+
+    def __init__(self, container_id: str, name: str, started_at: str, api_key: str):
+        self.container_id = container_id
+        self.name = name
+        self.started_at = started_at
+        self.api_key = api_key
+
+    @classmethod
+    def from_inspect(cls, info: dict) -> Optional["ContainerKey"]:
+        """Build from a `docker inspect` / GET /containers/{id}/json record; None without a key."""
+        prefix = f"{API_KEY_ENV}="
+        for line in (info.get("Config") or {}).get("Env") or []:
+            if line.startswith(prefix):
+                return cls(
+                    info["Id"], info.get("Name", "").lstrip("/"),
+                    (info.get("State") or {}).get("StartedAt", ""), line[len(prefix):],
+                )
+        return None
+
+
+def _find_with_api(port: int, socket_path: str) -> Optional[ContainerKey]:
+    with DockerClient(socket_path) as docker:
+        for container in docker.containers():
+            if any(p.get("PublicPort") == port for p in container.get("Ports") or []):
+                found = ContainerKey.from_inspect(docker.inspect(container["Id"]))
+                if found:
+                    return found
+    return None
+
+
+def _find_with_cli(port: int) -> Optional[ContainerKey]:
+    # Two processes however many containers run: list IDs, then inspect them all at once
+    ps = subprocess.run(["docker", "ps", "-q", "--no-trunc"], capture_output=True, text=True, timeout=10)
+    ids = ps.stdout.split()
+    if ps.returncode != 0 or not ids:
+        return None
+    inspect = subprocess.run(["docker", "inspect", *ids], capture_output=True, text=True, timeout=10)
+    if inspect.returncode != 0:
+        return None
+    for info in json.loads(inspect.stdout):
+        bindings = ((info.get("NetworkSettings") or {}).get("Ports") or {}).values()
+        if any(b.get("HostPort") == str(port) for group in bindings if group for b in group):
+            found = ContainerKey.from_inspect(info)
+            if found:
+                return found
+    return None
+
+
+def find_container_key(port: int, socket_path: str = DEFAULT_DOCKER_SOCKET) -> Optional[ContainerKey]:
+    """Find the running container that publishes port and carries SYFT_ADMIN_API_KEY.
+
+    Asks the Docker Engine API over socket_path: one call lists containers
+    with their ports, one more inspects the match. If the socket can't be
+    reached (missing, no permission, a remote Docker context), falls back
+    to one `docker ps` plus one batched `docker inspect`.
+    """
+    try:
+        return _find_with_api(port, socket_path)
+    except (OSError, http.client.HTTPException, DockerError):
+        pass
+    try:
+        return _find_with_cli(port)
+    except (OSError, subprocess.SubprocessError, ValueError):
+        return None
+
+
+def _started_at(container_id: str, socket_path: str) -> Optional[str]:
+    """The container's start time if it is still running, else None; one call."""
+    try:
+        with DockerClient(socket_path) as docker:
+            info = docker.inspect(container_id)
+        state = info.get("State") or {}
+        return state.get("StartedAt") if state.get("Running") else None
+    except DockerError:
+        # 404: the container is gone
+        return None
+    except (OSError, http.client.HTTPException):
+        pass
+    result = subprocess.run(
+        ["docker", "inspect", "--format", "{{.State.Running}} {{.State.StartedAt}}", container_id],
+        capture_output=True, text=True, timeout=10,
+    )
+    running, _, started_at = result.stdout.strip().partition(" ")
+    return started_at if result.returncode == 0 and running == "true" else None
+
+
+class ApiKeyCache:
+    """Resolved port -> container -> API key mappings, in a file only the owner can read.
+
+    Entries are keyed by Docker socket and host port and record the
+    container ID and start time. ``get()`` trusts an entry only after one
+    inspect call confirms the same container is still running since the
+    same start time; a recreated or restarted container invalidates it. The
+    file is written atomically with mode 0600 in a 0700 directory, and a
+    file that isn't ours or that others can read is ignored.
+    """
+
+    def __init__(self, path: Path = DEFAULT_KEY_CACHE):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path) as f:
+                st = os.fstat(f.fileno())
+                if st.st_uid != os.getuid() or st.st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+                    return {}
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, entries: dict):
+        self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(entries, f, indent=2)
+        os.replace(tmp, self.path)
+
+    @staticmethod
+    def _key(port: int, socket_path: str) -> str:
+        return f"{socket_path}:{port}"
+
+    def get(self, port: int, socket_path: str = DEFAULT_DOCKER_SOCKET) -> Optional[ContainerKey]:
+        """The cached key for port if its container is unchanged, else None."""
+        entry = self._load().get(self._key(port, socket_path))
+        if not entry:
+            return None
+        try:
+            if _started_at(entry["container_id"], socket_path) != entry["started_at"]:
+                return None
+        except (OSError, subprocess.SubprocessError):
+            return None
+        return ContainerKey(entry["container_id"], entry["name"], entry["started_at"], entry["api_key"])
+
+    def put(self, port: int, found: ContainerKey, socket_path: str = DEFAULT_DOCKER_SOCKET):
+        with self._lock:
+            entries = self._load()
+            entries[self._key(port, socket_path)] = {
+                "container_id": found.container_id,
+                "name": found.name,
+                "started_at": found.started_at,
+                "api_key": found.api_key,
+                "resolved_at": time.time(),
+            }
+            self._save(entries)
+
+    def forget(self, port: int, socket_path: str = DEFAULT_DOCKER_SOCKET):
+        with self._lock:
+            entries = self._load()
+            if entries.pop(self._key(port, socket_path), None) is not None:
+                self._save(entries)
+
+
+def resolve_container_key(
+    port: int, socket_path: str = DEFAULT_DOCKER_SOCKET, cache: Optional[ApiKeyCache] = None, refresh: bool = False
+) -> Optional[ContainerKey]:
+    """find_container_key through cache: a still-valid entry skips the lookup.
+
+    refresh skips the cache (e.g. after the API rejected the cached key)
+    and replaces the entry with whatever the lookup finds.
+    """
+    if cache is not None and not refresh:
+        cached = cache.get(port, socket_path)
+        if cached is not None:
+            return cached
+    found = find_container_key(port, socket_path)
+    if cache is not None:
+        try:
+            if found:
+                cache.put(port, found, socket_path)
+            else:
+                cache.forget(port, socket_path)
+        except OSError:
+            pass
+    return found
@@ -0,0 +1,118 @@
+"""Hedged requests: race a backup call against a slow primary and keep the first good answer."""
+
+import queue
+import threading
+from typing import Callable, Optional, TypeVar
+
+from llm_metrics import LLMMetrics
+
+T = TypeVar("T")
+
+
+class HedgePolicy:
+    """When to fire a backup request to a secondary model, and what hedging cost.
+
+    The backup fires once the primary has been outstanding longer than the
+    ``percentile`` of the primary model's observed latency (``initial_delay``
+    until ``min_samples`` requests have been measured), or as soon as the
+    primary fails. The first good response wins and the other attempt is
+    cancelled, then waited for, so it never outlives the call that started
+    it. Cancelling only takes effect between stream chunks, so only
+    streamed requests are worth hedging. Only completed requests are
+    measured, so a primary that keeps losing pulls the percentile down and
+    hedges fire a little earlier over time.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        metrics: LLMMetrics,
+        percentile: float = 95.0,
+        min_samples: int = 20,
+        initial_delay: float = 30.0,
+    ):
+        self.model = model
+        self.metrics = metrics
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.fired = 0
+        self.backup_won = 0
+        self.wasted_tokens = 0
+
+    def delay(self, primary_model: str) -> float:
+        """Seconds to wait for the primary before hedging."""
+        if self.metrics.count(primary_model) < self.min_samples:
+            return self.initial_delay
+        return self.metrics.latency_percentile(primary_model, self.percentile)
+
+    def add_waste(self, tokens: int):
+        with self._lock:
+            self.wasted_tokens += tokens
+
+    def run(
+        self,
+        primary: Callable[[threading.Event], Optional[T]],
+        backup: Callable[[threading.Event], Optional[T]],
+        delay: float,
+        on_hedge: Optional[Callable[[], None]] = None,
+    ) -> tuple[Optional[T], str]:
+        """Race primary against a delayed backup; returns (result, "primary"|"backup").
+
+        Each callable gets a cancel event it should honour and returns None
+        on failure. on_hedge is called when the backup fires. The result is
+        None only if both attempts failed. The losing attempt is cancelled
+        and joined before returning, so its usage is settled and it no
+        longer touches shared state (e.g. a partial output file).
+        """
+        results: queue.Queue = queue.Queue()
+        cancels = {"primary": threading.Event(), "backup": threading.Event()}
+
+        def attempt(label: str, fn):
+            try:
+                value = fn(cancels[label])
+            except Exception:
+                value = None
+            results.put((label, value))
+
+        threading.Thread(target=attempt, args=("primary", primary), daemon=True).start()
+        with self._lock:
+            self.requests += 1
+
+        outstanding = 1
+        try:
+            label, value = results.get(timeout=max(0.0, delay))
+            outstanding -= 1
+            if value is not None:
+                return value, label
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            self.fired += 1
+        if on_hedge:
+            on_hedge()
+        threading.Thread(target=attempt, args=("backup", backup), daemon=True).start()
+        outstanding += 1
+
+        while outstanding:
+            label, value = results.get()
+            outstanding -= 1
+            if value is not None:
+                if outstanding:
+                    cancels["primary" if label == "backup" else "backup"].set()
+                    results.get()
+                if label == "backup":
+                    with self._lock:
+                        self.backup_won += 1
+                return value, label
+        return None, "primary"
+
+    def summary(self) -> str:
+        rate = f" ({100 * self.fired / self.requests:.0f}% of requests)" if self.requests else ""
+        return (
+            f"{self.fired} fired{rate}, {self.backup_won} won by {self.model}, "
+            f"~{self.wasted_tokens} tokens spent on losing attempts"
+        )
@@ -0,0 +1,126 @@
+"""Content-addressed on-disk cache for LLM responses."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_CACHE_DIR = Path(os.getenv("LLM_CACHE_DIR", "./.llm_cache"))
+
+
+class LLMCache:
+    """Completed LLM responses, one JSON file per prompt hash.
+
+    Entries are keyed by a sha256 of everything that shapes the response
+    (model, system prompt, user prompt template, dataset name and formatted
+    samples), so a byte-identical prompt is never paid for twice. Files are
+    sharded by the first two hex digits and written atomically, so several
+    processes (or hosts sharing the directory) can use one cache. A hit
+    refreshes the entry's mtime; ``prune()`` drops entries unused for
+    ``max_age`` seconds and then the least recently used ones until the
+    cache fits in ``max_bytes``.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = 512 * 1024 * 1024, max_age: float = 90 * 86400):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    @staticmethod
+    def key(model: str, system_prompt: str, user_prompt_template: str, name: str, samples_text: str) -> str:
+        parts = [model, system_prompt, user_prompt_template, name, samples_text]
+        return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode()).hexdigest()
+
+    def _file(self, key: str) -> Path:
+        return self.path / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._file(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            entry = None
+        if entry is None or "content" not in entry:
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return entry["content"]
+
+    def put(self, key: str, content: str, model: str = ""):
+        path = self._file(key)
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"model": model, "created": time.time(), "content": content}, f)
+        os.replace(tmp, path)
+
+    def prune(self) -> int:
+        """Apply age and size limits; returns the number of entries removed."""
+        now = time.time()
+        entries = []
+        removed = 0
+        for shard in os.scandir(self.path):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                # Stale temp files are leftovers of interrupted writes
+                if now - st.st_mtime > self.max_age or (entry.name.endswith(".tmp") and now - st.st_mtime > 3600):
+                    removed += self._remove(entry.path)
+                elif entry.name.endswith(".json"):
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            removed += self._remove(path)
+            total -= size
+        with self._lock:
+            self.evicted += removed
+        return removed
+
+    @staticmethod
+    def _remove(path: str) -> int:
+        try:
+            os.remove(path)
+            return 1
+        except OSError:
+            return 0
+
+    def summary(self) -> str:
+        lookups = self.hits + self.misses
+        ratio = f" ({100 * self.hits / lookups:.0f}% hit)" if lookups else ""
+        return f"{self.hits} hits, {self.misses} misses{ratio}, {self.evicted} evicted"
+
+
+def open_llm_cache(args) -> Optional[LLMCache]:
+    """Build the cache from the --llm-cache-* options (None if disabled).
+
+    deploy and generate both take them, from the shared llm_options parent parser.
+    """
+    if args.no_llm_cache:
+        return None
+    return LLMCache(
+        args.llm_cache_dir,
+        max_bytes=int(args.llm_cache_max_mb * 1024 * 1024),
+        max_age=args.llm_cache_max_age * 86400,
+    )
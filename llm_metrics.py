@@ -0,0 +1,94 @@
+"""Per-request LLM latency metrics: time to first token, throughput, total latency."""
+
+import json
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional
+
+
+def percentile(values: list[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q in 0-100) of values, or None if empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class LLMMetrics:
+    """Thread-safe collector of per-request LLM timings, grouped by model.
+
+    Each successful request records its time to first token (the full
+    latency for non-streamed calls), total latency and completion tokens.
+    Multi-dataset batch requests are grouped apart, as "<model> (batch)",
+    so their longer latencies don't skew the per-model percentiles that
+    hedging relies on.
+    If ``path`` is given, every record is also appended to it as a JSON
+    line, so runs can be compared offline to pick faster models.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self._lock = threading.Lock()
+        self._records: dict[str, list[dict]] = defaultdict(list)
+        self._file = open(path, "a") if path else None
+        self.aborted = 0
+
+    def record(
+        self, model: str, ttft: float, latency: float, completion_tokens: int, streamed: bool, name: str = "",
+        batch: bool = False,
+    ):
+        generation = latency - ttft
+        record = {
+            "model": model,
+            "name": name,
+            "streamed": streamed,
+            "batch": batch,
+            "ttft_s": round(ttft, 4),
+            "latency_s": round(latency, 4),
+            "completion_tokens": completion_tokens,
+            "tokens_per_sec": round(completion_tokens / generation, 1) if generation > 0 else None,
+        }
+        with self._lock:
+            self._records[f"{model} (batch)" if batch else model].append(record)
+            if self._file:
+                self._file.write(json.dumps({"ts": round(time.time(), 3), **record}) + "\n")
+                self._file.flush()
+
+    def record_abort(self):
+        """Count a stream aborted by the inactivity timeout."""
+        with self._lock:
+            self.aborted += 1
+
+    def latency_percentile(self, model: str, q: float) -> Optional[float]:
+        with self._lock:
+            return percentile([r["latency_s"] for r in self._records.get(model, [])], q)
+
+    def count(self, model: str) -> int:
+        with self._lock:
+            return len(self._records.get(model, []))
+
+    def summary(self) -> list[str]:
+        """One line per model: request count, p50/p95 TTFT and latency, median tokens/sec."""
+        lines = []
+        with self._lock:
+            for model, records in sorted(self._records.items()):
+                ttft = [r["ttft_s"] for r in records]
+                latency = [r["latency_s"] for r in records]
+                rates = [r["tokens_per_sec"] for r in records if r["tokens_per_sec"]]
+                rate = percentile(rates, 50)
+                lines.append(
+                    f"{model}: {len(records)} requests, "
+                    f"TTFT p50 {percentile(ttft, 50):.2f}s p95 {percentile(ttft, 95):.2f}s, "
+                    f"latency p50 {percentile(latency, 50):.2f}s p95 {percentile(latency, 95):.2f}s, "
+                    + (f"{rate:.0f} tok/s" if rate else "tok/s n/a")
+                )
+            if self.aborted:
+                lines.append(f"{self.aborted} stalled streams aborted")
+        return lines
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
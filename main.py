@@ -24,7 +24,13 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from client import SyftClient
+from llm_cache import DEFAULT_CACHE_DIR
 from commands import cmd_list, cmd_deploy, cmd_delete, cmd_publish, cmd_update, cmd_generate
+from commands.deploy import api_workers
+from commands.generate import DEFAULT_LLM_BASE_URL, DEFAULT_SAMPLE_COUNT
+from ratelimit import AdaptiveRateLimiter
+from retry import RetryBudget
+from docker_api import DEFAULT_DOCKER_SOCKET, DEFAULT_KEY_CACHE, ApiKeyCache
 from utils import resolve_api_key
 
 
@@ -45,6 +51,84 @@ def main():
         default=os.getenv("SYFT_ADMIN_API_KEY", ""),
         help="Admin API key [env: SYFT_ADMIN_API_KEY]",
     )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=10,
+        help="Max pooled keep-alive HTTP connections to the API (default: 10)",
+    )
+    parser.add_argument(
+        "--async-client",
+        action="store_true",
+        help="Drive the API through AsyncSyftClient (--pool-size caps in-flight requests)",
+    )
+    parser.add_argument(
+        "--min-rate",
+        type=float,
+        default=0.2,
+        help="Floor for the adaptive request rate in req/s (default: 0.2)",
+    )
+    parser.add_argument(
+        "--max-rate",
+        type=float,
+        default=50.0,
+        help="Ceiling for the adaptive request rate in req/s (default: 50)",
+    )
+    parser.add_argument(
+        "--retry-budget",
+        type=int,
+        default=100,
+        help="Max retries of transient API failures per command run (default: 100)",
+    )
+
+    parser.add_argument(
+        "--docker-socket",
+        default=DEFAULT_DOCKER_SOCKET,
+        help="Docker Engine API socket used to auto-detect the API key [env: DOCKER_HOST=unix://...] (default: /var/run/docker.sock)",
+    )
+
+    parser.add_argument(
+        "--api-key-cache",
+        type=Path,
+        default=DEFAULT_KEY_CACHE,
+        help="Owner-only cache of auto-detected API keys, checked against the container's ID and start time (default: ~/.cache/syft-space-deploy/api-keys.json)",
+    )
+    parser.add_argument(
+        "--no-api-key-cache",
+        action="store_true",
+        help="Look the API key up in Docker on every run",
+    )
+
+    # LLM options shared by deploy (--generate-missing) and generate
+    llm_options = argparse.ArgumentParser(add_help=False)
+    llm_options.add_argument(
+        "--llm-base-url",
+        default=DEFAULT_LLM_BASE_URL,
+        help="OpenAI-compatible chat-completions base URL for generation [env: OPENROUTER_BASE_URL]",
+    )
+    llm_options.add_argument(
+        "--llm-cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help="On-disk cache of generated descriptions, keyed by prompt hash [env: LLM_CACHE_DIR] (default: ./.llm_cache)",
+    )
+    llm_options.add_argument(
+        "--llm-cache-max-mb",
+        type=float,
+        default=512,
+        help="Evict least recently used cache entries above this size (default: 512)",
+    )
+    llm_options.add_argument(
+        "--llm-cache-max-age",
+        type=float,
+        default=90,
+        help="Evict cache entries unused for this many days (default: 90)",
+    )
+    llm_options.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Always call the LLM; don't read or write the cache",
+    )
 
     subparsers = parser.add_subparsers(dest="command", help="Command to run")
 
@@ -54,23 +138,31 @@ def main():
     p_list.add_argument("--endpoints", action="store_true", help="List only endpoints")
 
     # -- deploy --
-    p_deploy = subparsers.add_parser("deploy", help="Deploy datasets and endpoints")
+    p_deploy = subparsers.add_parser("deploy", parents=[llm_options], help="Deploy datasets and endpoints")
     p_deploy.add_argument("--source-dir", type=Path, required=True, help="Host path to dataset root directory")
     p_deploy.add_argument("--container-dir", type=str, required=True, help="Container path that maps to source-dir")
     p_deploy.add_argument("--name-template", default="{name}", help="Dataset name template (default: '{name}')")
     p_deploy.add_argument("--slug-template", default="{name}", help="Endpoint slug template (default: '{name}')")
     p_deploy.add_argument("--summary-template", default="{name}", help="Summary template (default: '{name}')")
     p_deploy.add_argument("--tags", default="", help="Comma-separated tags")
-    p_deploy.add_argument("--file-types", default=None, help="Comma-separated file extensions (default: auto-detect)")
-    p_deploy.add_argument("--descriptions", type=Path, default=None, help="Path to descriptions JSON file (fallback)")
+    p_deploy.add_argument("--file-types", default=None, help="Comma-separated file extensions for every dataset (default: each dataset's own, auto-detected)")
+    p_deploy.add_argument("--descriptions", type=Path, default=None, help="Path to descriptions JSON or JSONL file (fallback)")
     p_deploy.add_argument("--generate-missing", action="store_true", help="Generate journal_description.md via AI for datasets missing one")
     p_deploy.add_argument("--response-type", default="both", help="Endpoint response type (default: 'both')")
     p_deploy.add_argument("--publish", action="store_true", help="Mark endpoints as published immediately")
     p_deploy.add_argument("--dry-run", action="store_true", help="Preview without making changes")
     p_deploy.add_argument("--limit", type=int, default=0, help="Limit to N datasets (0 = all)")
+    p_deploy_mode = p_deploy.add_mutually_exclusive_group()
+    p_deploy_mode.add_argument("--plan", action="store_true", help="Fetch live state once and show the create/update/no-op/orphan diff")
+    p_deploy_mode.add_argument("--apply", action="store_true", help="Fetch live state once and execute only the planned diff")
     p_deploy.add_argument("--resume", action="store_true", help="Skip already-deployed datasets")
-    p_deploy.add_argument("--delay", type=float, default=0.5, help="Delay between API calls in seconds")
-    p_deploy.add_argument("--progress-file", type=Path, default=Path("./progress.json"), help="Progress file path")
+    p_deploy.add_argument("--workers", type=int, default=1, help="Default worker count per pipeline stage (default: 1)")
+    p_deploy.add_argument("--stage-workers", default="", help="Per-stage workers, e.g. 'describe=8,publish=2' (stages: describe, dataset, endpoint, publish)")
+    p_deploy.add_argument("--stage-rates", default="", help="Per-stage rate caps in items/s, e.g. 'dataset=5,publish=1' (default: uncapped)")
+    p_deploy.add_argument("--delay", type=float, default=0.5, help="Initial delay between API calls in seconds; adapts to server health")
+    p_deploy.add_argument("--scan-workers", type=int, default=16, help="Threads walking dataset trees for file types (default: 16)")
+    p_deploy.add_argument("--index", type=Path, default=None, help="Persistent source-tree index (SQLite); only changed datasets are rescanned (default: off)")
+    p_deploy.add_argument("--progress-file", type=Path, default=Path("./progress.db"), help="SQLite progress store (a .json path is imported into a sibling .db)")
 
     # -- delete --
     p_delete = subparsers.add_parser("delete", help="Delete datasets and/or endpoints")
@@ -78,39 +170,54 @@ def main():
     p_delete.add_argument("--endpoints", action="store_true", help="Delete only endpoints")
     p_delete.add_argument("--dry-run", action="store_true", help="Preview without making changes")
     p_delete.add_argument("--yes", "-y", action="store_true", help="Skip confirmation")
-    p_delete.add_argument("--delay", type=float, default=0.3, help="Delay between API calls in seconds")
+    p_delete.add_argument("--delay", type=float, default=0.3, help="Initial delay between API calls in seconds; adapts to server health")
 
     # -- publish --
     p_publish = subparsers.add_parser("publish", help="Publish unpublished endpoints")
     p_publish.add_argument("--dry-run", action="store_true", help="Preview without making changes")
     p_publish.add_argument("--limit", type=int, default=0, help="Limit to N endpoints (0 = all)")
-    p_publish.add_argument("--delay", type=float, default=0.3, help="Delay between API calls in seconds")
+    p_publish.add_argument("--delay", type=float, default=0.3, help="Initial delay between API calls in seconds; adapts to server health")
 
     # -- update --
     p_update = subparsers.add_parser("update", help="Update endpoint descriptions")
-    p_update.add_argument("--descriptions", type=Path, required=True, help="Path to descriptions JSON file")
+    p_update.add_argument("--descriptions", type=Path, required=True, help="Path to descriptions JSON or JSONL file")
     p_update.add_argument("--summary-template", default=None, help="Summary template for updated endpoints")
     p_update.add_argument("--dry-run", action="store_true", help="Preview without making changes")
     p_update.add_argument("--limit", type=int, default=0, help="Limit to N endpoints (0 = all)")
     p_update.add_argument("--resume", action="store_true", help="Skip already-updated endpoints")
-    p_update.add_argument("--delay", type=float, default=0.5, help="Delay between API calls in seconds")
-    p_update.add_argument("--progress-file", type=Path, default=Path("./progress.json"), help="Progress file path")
+    p_update.add_argument("--delay", type=float, default=0.5, help="Initial delay between API calls in seconds; adapts to server health")
+    p_update.add_argument("--progress-file", type=Path, default=Path("./progress.db"), help="SQLite progress store (a .json path is imported into a sibling .db)")
 
     # -- generate --
-    p_gen = subparsers.add_parser("generate", help="Generate AI descriptions for datasets")
+    p_gen = subparsers.add_parser("generate", parents=[llm_options], help="Generate AI descriptions for datasets")
     p_gen.add_argument("--source-dir", type=Path, required=True, help="Path to dataset root directory")
-    p_gen.add_argument("--output", type=Path, default=Path("./descriptions.json"), help="Output JSON file")
+    p_gen.add_argument("--output", type=Path, default=Path("./descriptions.json"), help="Output file: .json map rewritten per description, or .jsonl append-only log")
+    p_gen.add_argument("--compact-to", type=Path, default=None, help="After the run, write the --output contents as a JSON map to this path")
     p_gen.add_argument("--system-prompt", default=None, help="Override system prompt text")
     p_gen.add_argument("--system-prompt-file", type=Path, default=None, help="Read system prompt from file")
     p_gen.add_argument("--user-prompt-template", default=None, help="User prompt template with {name} and {samples}")
     p_gen.add_argument("--metadata-field", default="title", help="JSON field for item title (default: 'title')")
     p_gen.add_argument("--abstract-field", default="abstract", help="JSON field for item abstract (default: 'abstract')")
-    p_gen.add_argument("--sample-count", type=int, default=5, help="Items to sample per dataset (default: 5)")
+    p_gen.add_argument("--sample-count", type=int, default=DEFAULT_SAMPLE_COUNT, help="Items to sample per dataset (default: 5)")
+    p_gen.add_argument("--sampling", choices=["first", "reservoir"], default="first", help="'first': leading items of the first metadata file; 'reservoir': uniform sample across all JSON/JSONL files (default: first)")
+    p_gen.add_argument("--sample-seed", type=int, default=0, help="Seed for --sampling reservoir (default: 0)")
     p_gen.add_argument("--model", default="anthropic/claude-3.5-sonnet", help="OpenRouter model ID")
     p_gen.add_argument("--dry-run", action="store_true", help="Preview without making API calls")
     p_gen.add_argument("--limit", type=int, default=0, help="Limit to N datasets (0 = all)")
     p_gen.add_argument("--resume", action="store_true", help="Skip already-generated descriptions")
-    p_gen.add_argument("--delay", type=float, default=1.5, help="Delay between API calls in seconds")
+    p_gen.add_argument("--index", type=Path, default=None, help="Persistent source-tree index (SQLite); only changed datasets are rescanned (default: off)")
+    p_gen.add_argument("--delay", type=float, default=1.5, help="Initial delay between API calls in seconds; adapts to server health")
+    p_gen.add_argument("--stream", action="store_true", help="Stream completions (SSE); abort stalled streams after --stream-idle-timeout")
+    p_gen.add_argument("--stream-idle-timeout", type=float, default=30.0, help="Seconds a stream may go silent before it is aborted (default: 30)")
+    p_gen.add_argument("--llm-metrics", type=Path, default=None, help="Append per-request TTFT/latency/tokens records to this JSONL file")
+    p_gen.add_argument("--hedge-model", default=None, help="Secondary model to race against --model when it is slow (default: off)")
+    p_gen.add_argument("--hedge-percentile", type=float, default=95.0, help="Hedge once a request outlasts this percentile of --model latency (default: 95)")
+    p_gen.add_argument("--hedge-min-samples", type=int, default=20, help="Requests to measure before using the percentile (default: 20)")
+    p_gen.add_argument("--hedge-after", type=float, default=30.0, help="Hedge delay in seconds until enough samples exist (default: 30)")
+    p_gen.add_argument("--batch-size", type=int, default=1, help="Datasets per OpenRouter request; replies are split per dataset, with single-request fallback (default: 1)")
+    p_gen.add_argument("--concurrency", type=int, default=4, help="Parallel OpenRouter requests (default: 4)")
+    p_gen.add_argument("--rpm", type=float, default=0, help="OpenRouter requests-per-minute limit (default: 0 = off)")
+    p_gen.add_argument("--tpm", type=float, default=0, help="OpenRouter tokens-per-minute limit, estimated before each call (default: 0 = off)")
 
     args = parser.parse_args()
 
@@ -120,15 +227,21 @@ def main():
 
     # Resolve API key: explicit flag > env var > Docker container auto-detect
     api_key = args.api_key
+    on_unauthorized = None
     if not api_key:
-        api_key = resolve_api_key(args.api_url)
+        key_cache = None if args.no_api_key_cache else ApiKeyCache(args.api_key_cache)
+        api_key = resolve_api_key(args.api_url, args.docker_socket, key_cache)
+
+        def on_unauthorized() -> str:
+            # The cached or detected key was rejected: look it up again
+            print("API key rejected (401), re-detecting it from Docker")
+            return resolve_api_key(args.api_url, args.docker_socket, key_cache, refresh=True)
+
         if api_key:
             print(f"Auto-detected API key from Docker container\n")
         else:
             print("Warning: No API key provided. Set --api-key or SYFT_ADMIN_API_KEY.\n")
 
-    client = SyftClient(args.api_url, api_key)
-
     commands = {
         "list": cmd_list,
         "deploy": cmd_deploy,
@@ -138,7 +251,42 @@ def main():
         "generate": cmd_generate,
     }
 
-    return commands[args.command](client, args)
+    # --delay seeds the adaptive limiter; it then tracks what the server can take
+    delay = getattr(args, "delay", 0)
+    rate_limiter = AdaptiveRateLimiter(
+        rate=1 / delay if delay > 0 else args.max_rate,
+        min_rate=args.min_rate,
+        max_rate=args.max_rate,
+    )
+    retry_budget = RetryBudget(args.retry_budget)
+
+    # Keep enough pooled connections for every worker that may call the API at once
+    pool_size = args.pool_size
+    if args.command == "deploy":
+        pool_size = max(pool_size, api_workers(args))
+
+    if args.async_client:
+        # Imported here so quick commands don't pay for asyncio at startup
+        from async_client import AsyncSyftClient, BlockingSyftClient
+
+        client = BlockingSyftClient(
+            AsyncSyftClient(
+                args.api_url,
+                api_key,
+                max_in_flight=pool_size,
+                rate_limiter=rate_limiter,
+                retry_budget=retry_budget,
+                on_unauthorized=on_unauthorized,
+            )
+        )
+    else:
+        client = SyftClient(
+            args.api_url, api_key, pool_size=pool_size, rate_limiter=rate_limiter, retry_budget=retry_budget,
+            on_unauthorized=on_unauthorized,
+        )
+
+    with client:
+        return commands[args.command](client, args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,130 @@
+"""Queue-connected processing stages with per-stage workers, rate limits and metrics."""
+
+import queue
+import threading
+import time
+from typing import Callable, Optional
+
+from ratelimit import TokenBucket
+
+_STOP = object()
+
+
+class Stage:
+    """One pipeline step: a queue drained by its own pool of worker threads.
+
+    handler(item) returns True to pass the item to the next stage, or False
+    when the item is finished (done early or failed).
+    """
+
+    def __init__(self, name: str, handler: Callable, workers: int = 1, rate: float = 0.0):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.limiter = TokenBucket(rate) if rate > 0 else None
+        self.queue: queue.Queue = queue.Queue()
+        self.next: Optional["Stage"] = None
+
+        self.processed = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.busy = 0.0
+        self._first_start: Optional[float] = None
+        self._last_end: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def put(self, item):
+        self.queue.put(item)
+        with self._lock:
+            self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    def throughput(self) -> float:
+        """Items per second over the window this stage was active."""
+        if self._first_start is None or self._last_end is None:
+            return 0.0
+        elapsed = self._last_end - self._first_start
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.name:<14} workers={self.workers:<3} processed={self.processed:<6} "
+            f"errors={self.errors:<4} max_queue={self.max_depth:<6} "
+            f"busy={self.busy:7.1f}s  {self.throughput():6.2f} items/s"
+        )
+
+
+class Pipeline:
+    """Chains stages in order; items can enter at any stage.
+
+    on_done(item, error) is called exactly once per submitted item, from the
+    worker thread that finished it (error is the exception, if one escaped).
+    """
+
+    def __init__(self, stages: list[Stage], on_done: Callable):
+        self.stages = {stage.name: stage for stage in stages}
+        for stage, nxt in zip(stages, stages[1:]):
+            stage.next = nxt
+        self._first = stages[0]
+        self._on_done = on_done
+        self._pending = 0
+        self._cond = threading.Condition()
+        self._threads: list[threading.Thread] = []
+
+    def start(self):
+        for stage in self.stages.values():
+            for i in range(stage.workers):
+                t = threading.Thread(target=self._work, args=(stage,), name=f"{stage.name}-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def submit(self, item, stage: Optional[str] = None):
+        """Queue an item at the named stage (default: the first)."""
+        with self._cond:
+            self._pending += 1
+        (self.stages[stage] if stage else self._first).put(item)
+
+    def _finish(self, item, error: Optional[BaseException] = None):
+        try:
+            self._on_done(item, error)
+        finally:
+            with self._cond:
+                self._pending -= 1
+                self._cond.notify_all()
+
+    def _work(self, stage: Stage):
+        while True:
+            item = stage.queue.get()
+            if item is _STOP:
+                return
+            if stage.limiter:
+                stage.limiter.acquire()
+            start = time.monotonic()
+            error = None
+            try:
+                forward = stage.handler(item)
+            except Exception as e:
+                forward, error = False, e
+            end = time.monotonic()
+            with stage._lock:
+                stage.processed += 1
+                stage.errors += error is not None
+                stage.busy += end - start
+                if stage._first_start is None:
+                    stage._first_start = start
+                stage._last_end = end
+            if forward and stage.next:
+                stage.next.put(item)
+            else:
+                self._finish(item, error)
+
+    def join(self):
+        """Wait for every submitted item to finish, then stop the workers."""
+        with self._cond:
+            # Timed waits keep the main thread responsive to Ctrl-C
+            while self._pending:
+                self._cond.wait(timeout=0.5)
+        for stage in self.stages.values():
+            for _ in range(stage.workers):
+                stage.queue.put(_STOP)
+        for t in self._threads:
+            t.join()
@@ -0,0 +1,196 @@
+"""Transactional SQLite progress store shared by deploy and update."""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from utils import load_progress
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS progress (
+    kind         TEXT NOT NULL,
+    name         TEXT NOT NULL,
+    status       TEXT NOT NULL,
+    fingerprints TEXT,
+    created_at   REAL NOT NULL,
+    updated_at   REAL NOT NULL,
+    PRIMARY KEY (kind, name)
+);
+CREATE INDEX IF NOT EXISTS progress_status ON progress (kind, status);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class ProgressStore:
+    """Per-item progress in SQLite (WAL mode).
+
+    Rows are keyed by (kind, name), where kind is "deploy" or "update", and
+    hold the latest status ("deployed", "updated", "failed"), optional
+    payload fingerprints and timestamps. Marks are buffered and written in
+    one short transaction every ``batch_size`` marks or ``flush_interval``
+    seconds; ``flush()``/``close()`` write the rest. Several processes can
+    share one file: WAL lets readers run alongside a writer, and writers
+    wait on the busy timeout. With ``read_only`` (dry runs) the store is
+    an in-memory copy of the file, if it exists, and nothing is written to
+    disk.
+    """
+
+    def __init__(self, path: Path, batch_size: int = 50, flush_interval: float = 2.0, read_only: bool = False):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: dict[tuple[str, str], tuple] = {}
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        if read_only:
+            self._conn = sqlite3.connect(":memory:", check_same_thread=False, isolation_level=None)
+            if self.path.exists():
+                # Only read from; a plain connection removes its WAL side files on close, unlike mode=ro
+                source = sqlite3.connect(self.path, timeout=30)
+                try:
+                    source.backup(self._conn)
+                finally:
+                    source.close()
+        else:
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def _row(self, kind: str, name: str) -> Optional[tuple]:
+        # Unflushed marks from this process take precedence over the table
+        if (kind, name) in self._buffer:
+            status, fingerprints = self._buffer[(kind, name)][2:4]
+            if fingerprints is None:
+                row = self._conn.execute(
+                    "SELECT fingerprints FROM progress WHERE kind = ? AND name = ?", (kind, name)
+                ).fetchone()
+                fingerprints = row[0] if row else None
+            return status, fingerprints
+        return self._conn.execute(
+            "SELECT status, fingerprints FROM progress WHERE kind = ? AND name = ?", (kind, name)
+        ).fetchone()
+
+    def status(self, kind: str, name: str) -> Optional[str]:
+        with self._lock:
+            row = self._row(kind, name)
+        return row[0] if row else None
+
+    def fingerprints(self, name: str) -> Optional[dict]:
+        with self._lock:
+            row = self._row("deploy", name)
+        return json.loads(row[1]) if row and row[1] else None
+
+    def count(self, kind: str, status: str) -> int:
+        self.flush()
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM progress WHERE kind = ? AND status = ?", (kind, status)
+            ).fetchone()[0]
+
+    def mark(self, kind: str, name: str, status: str, fingerprints: Optional[dict] = None):
+        """Record the latest status of an item (fingerprints are kept if not given)."""
+        now = time.time()
+        with self._lock:
+            encoded = json.dumps(fingerprints) if fingerprints else None
+            if encoded is None and (kind, name) in self._buffer:
+                encoded = self._buffer[(kind, name)][3]
+            self._buffer[(kind, name)] = (kind, name, status, encoded, now, now)
+            if len(self._buffer) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._write()
+
+    def _write(self):
+        if self._buffer:
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._conn.executemany(
+                    """
+                    INSERT INTO progress (kind, name, status, fingerprints, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (kind, name) DO UPDATE SET
+                        status = excluded.status,
+                        fingerprints = COALESCE(excluded.fingerprints, progress.fingerprints),
+                        updated_at = excluded.updated_at
+                    """,
+                    list(self._buffer.values()),
+                )
+            self._buffer.clear()
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        """Write any buffered marks."""
+        with self._lock:
+            self._write()
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def import_json(self, path: Path) -> int:
+        """Import a legacy progress.json file; returns the number of rows written.
+
+        Later entries win, so a dataset listed as failed and then deployed
+        ends up deployed.
+        """
+        progress = load_progress(Path(path))
+        fingerprints = progress.get("fingerprints", {})
+        count = 0
+        for name in progress.get("failed", []):
+            self.mark("deploy", name, "failed")
+            count += 1
+        for name in progress.get("deployed", []):
+            self.mark("deploy", name, "deployed", fingerprints.get(name))
+            count += 1
+        for slug in progress.get("updated", []):
+            self.mark("update", slug, "updated")
+            count += 1
+        self.flush()
+        return count
+
+    def _imported(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def import_json_once(self, path: Path) -> int:
+        """Import a progress.json file unless this version of it was already imported."""
+        path = Path(path)
+        if not path.exists():
+            return 0
+        key = f"imported:{path.resolve()}"
+        version = str(path.stat().st_mtime_ns)
+        if self._imported(key) == version:
+            return 0
+        count = self.import_json(path)
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, version))
+        return count
+
+
+def open_progress(path: Path, read_only: bool = False) -> ProgressStore:
+    """Open the progress store for --progress-file.
+
+    A .json path is treated as a legacy file: progress lives in the sibling
+    .db file and the JSON is imported into it once. A sibling .json next to
+    a .db path is picked up the same way. read_only (--dry-run) reads both
+    into memory and leaves the files untouched.
+    """
+    path = Path(path)
+    db_path = path.with_suffix(".db") if path.suffix == ".json" else path
+    store = ProgressStore(db_path, read_only=read_only)
+    imported = store.import_json_once(db_path.with_suffix(".json"))
+    if imported and not read_only:
+        print(f"Imported {imported} entries from {db_path.with_suffix('.json')} into {db_path}")
+    return store
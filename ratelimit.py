@@ -0,0 +1,202 @@
+"""Adaptive rate limiting shared by the Syft Space and OpenRouter clients."""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+# Status codes that mean "slow down" rather than "bad request"
+THROTTLE_STATUSES = {429, 503}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Thread-safe token bucket with a fixed refill rate in requests/second."""
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.burst = burst
+        self._rate = rate
+        self._tokens = burst
+        self._last_refill = time.monotonic()
+        self._pause_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """Current allowed request rate in requests/second."""
+        return self._rate
+
+    def _refill(self, now: float):
+        elapsed = now - self._last_refill
+        self._tokens = min(self.burst, self._tokens + elapsed * self._rate)
+        self._last_refill = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available right now, without waiting."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now >= self._pause_until and self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self, amount: float = 1.0):
+        """Block until ``amount`` tokens (one request by default) can be taken."""
+        amount = min(amount, self.burst)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._pause_until - now
+                if wait <= 0:
+                    if self._tokens >= amount:
+                        self._tokens -= amount
+                        return
+                    wait = (amount - self._tokens) / self._rate
+            time.sleep(wait)
+
+    def credit(self, amount: float):
+        """Return unused tokens (positive) or charge extra ones (negative).
+
+        A negative balance is allowed; later callers wait until it refills.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.burst, self._tokens + amount)
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    """Token bucket whose refill rate tracks server health (AIMD).
+
+    Each healthy response raises the rate additively (by roughly ``increase``
+    req/s per second of traffic). A 429/503, a connection error, or a latency
+    spike above ``latency_factor`` times the running average cuts it
+    multiplicatively by ``decrease``. A Retry-After header pauses all callers
+    until it expires. Thread-safe, so one limiter can pace a worker pool.
+    """
+
+    def __init__(
+        self,
+        rate: float = 2.0,
+        min_rate: float = 0.2,
+        max_rate: float = 50.0,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        burst: float = 1.0,
+        latency_factor: float = 3.0,
+    ):
+        super().__init__(min(max(rate, min_rate), max_rate), burst)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+
+        self._last_decrease = 0.0
+        self._avg_latency: Optional[float] = None
+        self._samples = 0
+
+        self.throttled = 0
+        self.backoffs = 0
+
+    def _back_off(self, now: float):
+        # One cut per ~round of in-flight requests, so a burst of failures
+        # from the same overload doesn't collapse the rate to the floor.
+        if now - self._last_decrease < max(1.0, 1.0 / self._rate):
+            return
+        self._rate = max(self.min_rate, self._rate * self.decrease)
+        self._last_decrease = now
+        self.backoffs += 1
+
+    def record(self, status_code: Optional[int], latency: float, retry_after: Optional[str] = None):
+        """Feed back the outcome of a request.
+
+        status_code is None for connection errors/timeouts.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if status_code is None or status_code in THROTTLE_STATUSES:
+                if status_code is not None:
+                    self.throttled += 1
+                delay = parse_retry_after(retry_after)
+                if delay:
+                    self._pause_until = max(self._pause_until, now + delay)
+                self._back_off(now)
+                return
+
+            slow = (
+                self._avg_latency is not None
+                and self._samples >= 5
+                and latency > self.latency_factor * self._avg_latency
+            )
+            if self._avg_latency is None:
+                self._avg_latency = latency
+            else:
+                self._avg_latency = 0.9 * self._avg_latency + 0.1 * latency
+            self._samples += 1
+
+            if slow:
+                self._back_off(now)
+            else:
+                self._rate = min(self.max_rate, self._rate + self.increase / self._rate)
+
+    def summary(self) -> str:
+        return f"{self._rate:.1f} req/s ({self.throttled} throttled, {self.backoffs} backoffs)"
+
+
+class UsageLimiter:
+    """Requests-per-minute and tokens-per-minute budget for an LLM API.
+
+    ``acquire(estimate)`` waits for one request slot and ``estimate``
+    tokens; ``settle(estimate, actual)`` corrects the token bucket once the
+    response reports real usage. Each bucket holds ten seconds' worth of
+    budget, so a worker pool can't spend a whole minute's quota at once.
+    A limit of 0 disables that bucket.
+    """
+
+    def __init__(self, rpm: float = 0, tpm: float = 0):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = TokenBucket(rpm / 60, burst=max(1.0, rpm / 6)) if rpm > 0 else None
+        self._tokens = TokenBucket(tpm / 60, burst=max(1.0, tpm / 6)) if tpm > 0 else None
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.tokens_used = 0
+
+    def acquire(self, estimate: int):
+        if self._requests:
+            self._requests.acquire()
+        if self._tokens:
+            self._tokens.acquire(estimate)
+        with self._lock:
+            self.requests += 1
+
+    def settle(self, estimate: int, actual: Optional[int]):
+        """Record actual token usage (None keeps the estimate charged and counted)."""
+        if actual is None:
+            actual = estimate
+        elif self._tokens:
+            self._tokens.credit(estimate - actual)
+        with self._lock:
+            self.tokens_used += actual
+
+    def summary(self) -> str:
+        limits = ", ".join(
+            f"{value:g} {unit}" for value, unit in ((self.rpm, "rpm"), (self.tpm, "tpm")) if value > 0
+        ) or "no rpm/tpm limit"
+        return f"{self.requests} requests, {self.tokens_used} tokens ({limits})"
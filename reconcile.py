@@ -0,0 +1,114 @@
+"""Plan/apply reconciliation: diff the desired deploy state against live Syft Space state."""
+
+from typing import Callable, Optional
+
+# Endpoint fields deploy owns and can change in place with a PATCH
+MANAGED_FIELDS = ("description", "summary", "response_type", "tags")
+
+
+def _normalize(field: str, value):
+    # The API may echo tags back as a list while deploy sends a comma string
+    if field == "tags":
+        if isinstance(value, str):
+            value = value.split(",")
+        return sorted(t.strip() for t in value or [] if t.strip())
+    return value
+
+
+def endpoint_changes(live: dict, desired: dict) -> dict:
+    """Return the managed fields of desired that differ from the live endpoint.
+
+    Fields whose desired value is None (not known yet) are left alone.
+    """
+    return {
+        field: desired[field]
+        for field in MANAGED_FIELDS
+        if desired.get(field) is not None and _normalize(field, live.get(field)) != _normalize(field, desired[field])
+    }
+
+
+class PlanItem:
+    """One dataset's planned action."""
+
+    __slots__ = ("name", "action", "dataset_payload", "endpoint_payload", "dataset_id", "changes", "publish")
+
+    def __init__(self, name: str, action: str, dataset_payload: dict, endpoint_payload: dict):
+        self.name = name
+        self.action = action
+        self.dataset_payload = dataset_payload
+        self.endpoint_payload = endpoint_payload
+        self.dataset_id: Optional[str] = None
+        self.changes: dict = {}
+        self.publish = False
+
+
+class Plan:
+    """Create/update/no-op/orphan diff between the source tree and the server."""
+
+    def __init__(self):
+        self.create: list[PlanItem] = []
+        self.update: list[PlanItem] = []
+        self.noop: list[PlanItem] = []
+        self.orphan_datasets: list[str] = []
+        self.orphan_endpoints: list[str] = []
+
+    @property
+    def publish_only(self) -> list[PlanItem]:
+        return [item for item in self.noop if item.publish]
+
+    @property
+    def to_publish(self) -> list[PlanItem]:
+        """Existing endpoints to publish: unchanged ones and ones published after their update."""
+        return [item for item in self.update + self.noop if item.publish]
+
+    def summary(self) -> str:
+        return (
+            f"{len(self.create)} to create, {len(self.update)} to update, "
+            f"{len(self.to_publish)} to publish, {len(self.noop) - len(self.publish_only)} unchanged, "
+            f"{len(self.orphan_datasets)} orphan datasets, {len(self.orphan_endpoints)} orphan endpoints"
+        )
+
+
+def build_plan(
+    desired: list[tuple[str, dict, dict]],
+    live_datasets: list[dict],
+    live_endpoints: list[dict],
+    needs_publish: Optional[Callable[[dict], bool]] = None,
+) -> Plan:
+    """Diff desired (name, dataset_payload, endpoint_payload) triples against live state.
+
+    Live resources are indexed by dataset name and endpoint slug, so the
+    diff is linear in the number of datasets. needs_publish, if given,
+    flags existing endpoints (updated or unchanged) that still have to be
+    published.
+    """
+    datasets_by_name = {ds["name"]: ds for ds in live_datasets}
+    endpoints_by_slug = {ep["slug"]: ep for ep in live_endpoints}
+
+    plan = Plan()
+    for name, dataset_payload, endpoint_payload in desired:
+        item = PlanItem(name, "noop", dataset_payload, endpoint_payload)
+        dataset = datasets_by_name.get(dataset_payload["name"])
+        endpoint = endpoints_by_slug.get(endpoint_payload["slug"])
+
+        if dataset is not None:
+            item.dataset_id = dataset.get("id")
+
+        if dataset is None or endpoint is None:
+            item.action = "create"
+            plan.create.append(item)
+            continue
+
+        item.changes = endpoint_changes(endpoint, endpoint_payload)
+        item.publish = bool(needs_publish and needs_publish(endpoint))
+        if item.changes:
+            item.action = "update"
+            plan.update.append(item)
+        else:
+            plan.noop.append(item)
+
+    wanted_datasets = {payload["name"] for _, payload, _ in desired}
+    wanted_endpoints = {payload["slug"] for _, _, payload in desired}
+    plan.orphan_datasets = sorted(set(datasets_by_name) - wanted_datasets)
+    plan.orphan_endpoints = sorted(set(endpoints_by_slug) - wanted_endpoints)
+    return plan
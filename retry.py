@@ -0,0 +1,65 @@
+"""Retry policies with capped exponential backoff, full jitter and a shared budget."""
+
+import random
+import threading
+
+# Responses worth retrying: throttling and transient upstream/gateway failures
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class AlreadyCreated(Exception):
+    """Raised when a create is abandoned because the resource now exists."""
+
+    def __init__(self, resource: dict):
+        super().__init__("resource already exists")
+        self.resource = resource
+
+
+class RetryPolicy:
+    """How often and how patiently one kind of operation is retried.
+
+    Delays use "full jitter": a uniform draw from [0, min(max_delay, base * 2**n)].
+    """
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 0.5, max_delay: float = 20.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, retry: int) -> float:
+        """Delay before retry number ``retry`` (0-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**retry))
+
+
+class RetryBudget:
+    """Caps the total number of retries across one command run.
+
+    Once spent, failures surface immediately instead of adding load to a
+    server that is already struggling. Thread-safe.
+    """
+
+    def __init__(self, max_retries: int = 100):
+        self.max_retries = max_retries
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            if self.used >= self.max_retries:
+                return False
+            self.used += 1
+            return True
+
+    def summary(self) -> str:
+        return f"{self.used} used of {self.max_retries}"
+
+
+# GET, DELETE and PATCH are idempotent and retry freely. POST retries less:
+# creates first check that the earlier attempt didn't land, and publish is
+# safe to repeat.
+DEFAULT_POLICIES = {
+    "GET": RetryPolicy(),
+    "DELETE": RetryPolicy(),
+    "PATCH": RetryPolicy(),
+    "POST": RetryPolicy(max_attempts=3),
+}
@@ -8,11 +8,11 @@ usage() {
 Usage: ./run.sh <command> [options]
 
 Commands:
-  deploy   <source-dir> <container-dir> [--port PORT] [--tags TAGS] [--name-tpl TPL] [--slug-tpl TPL] [--generate-missing] [--publish] [--dry-run]
+  deploy   <source-dir> <container-dir> [--port PORT] [--tags TAGS] [--name-tpl TPL] [--slug-tpl TPL] [--generate-missing] [--publish] [--workers N] [--dry-run]
   list     [--port PORT] [--datasets] [--endpoints]
   delete   [--port PORT] [--datasets] [--endpoints] [--yes] [--dry-run]
   publish  [--port PORT] [--dry-run]
-  generate <source-dir> [--port PORT] [--dry-run]
+  generate <source-dir> [--port PORT] [--concurrency N] [--dry-run]
 
 Options:
   --port PORT       Syft Space port (default: 8080, auto-detects API key)
@@ -43,6 +43,8 @@ GENERATE_MISSING=""
 PUBLISH=""
 DRY_RUN=""
 LIMIT=""
+WORKERS=""
+CONCURRENCY=""
 RESUME=""
 YES=""
 DATASETS_FLAG=""
@@ -75,6 +77,8 @@ while [[ $# -gt 0 ]]; do
         --summary-tpl) SUMMARY_TPL="$2"; shift 2 ;;
         --file-types)  FILE_TYPES="$2"; shift 2 ;;
         --limit)       LIMIT="$2"; shift 2 ;;
+        --workers)     WORKERS="$2"; shift 2 ;;
+        --concurrency) CONCURRENCY="$2"; shift 2 ;;
         --generate-missing) GENERATE_MISSING=1; shift ;;
         --publish)     PUBLISH=1; shift ;;
         --dry-run)     DRY_RUN=1; shift ;;
@@ -104,6 +108,7 @@ case "$COMMAND" in
         [[ -n "$DRY_RUN" ]]    && CMD+=( --dry-run )
         [[ -n "$LIMIT" ]]      && CMD+=( --limit "$LIMIT" )
         [[ -n "$RESUME" ]]     && CMD+=( --resume )
+        [[ -n "$WORKERS" ]]    && CMD+=( --workers "$WORKERS" )
         ;;
     list)
         CMD+=( list )
@@ -127,6 +132,7 @@ case "$COMMAND" in
         [[ -n "$DRY_RUN" ]] && CMD+=( --dry-run )
         [[ -n "$LIMIT" ]]   && CMD+=( --limit "$LIMIT" )
         [[ -n "$RESUME" ]]  && CMD+=( --resume )
+        [[ -n "$CONCURRENCY" ]] && CMD+=( --concurrency "$CONCURRENCY" )
         ;;
 esac
 
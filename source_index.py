@@ -0,0 +1,157 @@
+"""Persistent incremental index of the source tree (SQLite)."""
+
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from utils import DatasetInfo, dataset_entries, scan_datasets, walk_dataset
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS datasets (
+    root            TEXT NOT NULL,
+    name            TEXT NOT NULL,
+    mtime_ns        INTEGER NOT NULL,
+    subdir_mtimes   TEXT,
+    has_description INTEGER NOT NULL,
+    metadata_files  TEXT NOT NULL,
+    file_count      INTEGER NOT NULL,
+    total_bytes     INTEGER NOT NULL,
+    extensions      TEXT NOT NULL,
+    scanned_at_ns   INTEGER NOT NULL,
+    PRIMARY KEY (root, name)
+);
+"""
+
+# An mtime this close to the scan may hide a change made in the same
+# timestamp tick (coarse NFS/FAT clocks), so such directories are rescanned
+_RACY_NS = 2_000_000_000
+
+# Datasets checked per worker task
+_CHUNK = 256
+
+
+class SourceIndex:
+    """On-disk index of dataset directories: what a scan learns, keyed by directory mtimes.
+
+    Each row holds a dataset's description/metadata presence, file count,
+    total bytes, extension histogram and the mtime of its directory and of
+    every subdirectory. ``refresh()`` lists the source root, stats each recorded directory
+    and walks only datasets that are new or whose directories changed, so a
+    rerun over an unchanged tree costs one listing plus a stat per directory.
+    Directory mtimes change when entries are added, removed or renamed, not
+    when a file is rewritten in place, so in-place edits leave sizes stale
+    until something else touches the directory. Stats run on ``workers``
+    threads, which hides per-call latency on network filesystems. One index
+    file can hold several source roots.
+    """
+
+    def __init__(self, path: Path, workers: int = 16):
+        self.path = Path(path)
+        self.workers = workers
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self.rescanned = 0
+        self.unchanged = 0
+        self.removed = 0
+
+    @staticmethod
+    def _fresh(path: str, row: tuple) -> bool:
+        mtime_ns, subdir_mtimes, scanned_at_ns = row[0], row[1], row[7]
+        dirs = [(path, mtime_ns)]
+        if subdir_mtimes:
+            dirs += [(os.path.join(path, rel), mtime) for rel, mtime in json.loads(subdir_mtimes).items()]
+        for dir_path, expected in dirs:
+            try:
+                current = os.stat(dir_path).st_mtime_ns
+            except OSError:
+                return False
+            if current != expected or current >= scanned_at_ns - _RACY_NS:
+                return False
+        return True
+
+    def _refresh_one(self, entry: os.DirEntry, row: Optional[tuple]) -> tuple[DatasetInfo, Optional[tuple]]:
+        """Return the dataset's info and, if it had to be walked, its new row."""
+        if row is not None and self._fresh(entry.path, row):
+            metadata_files = tuple(row[3].split("\n")) if row[3] else ()
+            return DatasetInfo(
+                entry.name, Path(entry.path), bool(row[2]), metadata_files,
+                row[0] / 1e9, row[4], row[5], json.loads(row[6]),
+            ), None
+        scanned_at_ns = time.time_ns()
+        mtime_ns, subdir_mtimes, has_description, metadata_files, file_count, total_bytes, extensions = walk_dataset(
+            entry.path
+        )
+        info = DatasetInfo(
+            entry.name, Path(entry.path), has_description, tuple(metadata_files),
+            mtime_ns / 1e9, file_count, total_bytes, extensions,
+        )
+        new_row = (
+            mtime_ns, json.dumps(subdir_mtimes) if subdir_mtimes else None, int(has_description),
+            "\n".join(metadata_files), file_count, total_bytes, json.dumps(extensions), scanned_at_ns,
+        )
+        return info, new_row
+
+    def refresh(self, source_dir: Path) -> list[DatasetInfo]:
+        """Bring the index up to date with source_dir; returns its datasets sorted by name."""
+        root = str(Path(source_dir).resolve())
+        stored = {
+            name: row
+            for name, *row in self._conn.execute(
+                "SELECT name, mtime_ns, subdir_mtimes, has_description, metadata_files, file_count,"
+                " total_bytes, extensions, scanned_at_ns FROM datasets WHERE root = ?",
+                (root,),
+            )
+        }
+        entries = dataset_entries(source_dir)
+
+        def refresh_chunk(chunk: list[os.DirEntry]) -> list:
+            return [self._refresh_one(entry, stored.get(entry.name)) for entry in chunk]
+
+        # Chunks keep per-task executor overhead small next to the stat calls
+        chunks = [entries[i:i + _CHUNK] for i in range(0, len(entries), _CHUNK)]
+        with ThreadPoolExecutor(max_workers=max(1, self.workers)) as pool:
+            results = [result for chunk in pool.map(refresh_chunk, chunks) for result in chunk]
+
+        changed = [(root, info.name, *row) for info, row in results if row is not None]
+        gone = stored.keys() - {e.name for e in entries}
+        with self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO datasets (root, name, mtime_ns, subdir_mtimes, has_description,"
+                " metadata_files, file_count, total_bytes, extensions, scanned_at_ns)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                changed,
+            )
+            self._conn.executemany("DELETE FROM datasets WHERE root = ? AND name = ?", [(root, n) for n in gone])
+        self.rescanned += len(changed)
+        self.unchanged += len(results) - len(changed)
+        self.removed += len(gone)
+        return [info for info, _ in results]
+
+    def summary(self) -> str:
+        return f"{self.rescanned} rescanned, {self.unchanged} unchanged, {self.removed} removed"
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_datasets(source_dir: Path, index_path: Optional[Path] = None) -> list[DatasetInfo]:
+    """Datasets under source_dir, through the index at index_path (--index) when one is given."""
+    if index_path is None:
+        return scan_datasets(source_dir)
+    with SourceIndex(index_path) as index:
+        datasets = index.refresh(source_dir)
+        print(f"Index: {index.summary()} ({index_path})")
+    return datasets
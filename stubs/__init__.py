@@ -0,0 +1 @@
+"""Local stand-ins for external services, for offline benchmarks and load tests."""
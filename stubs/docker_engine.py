@@ -0,0 +1,185 @@
+"""Unix-socket stand-in for the Docker Engine API, for testing API key auto-detection.
+
+Serves GET /containers/json and GET /containers/{id}/json (optionally under
+a /vX.Y version prefix) for a set of fake running containers, one of which
+publishes --port and carries SYFT_ADMIN_API_KEY=--api-key:
+
+    python -m stubs.docker_engine --socket /tmp/docker.sock --containers 40 --port 8080 --api-key secret
+    python main.py --docker-socket /tmp/docker.sock --api-url http://127.0.0.1:8080/api/v1 list
+
+GET /_stats returns request counts per route.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import socketserver
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler
+from typing import Optional
+
+from stubs.syft_space import parse_latency
+
+_VERSION_RE = re.compile(r"^/v[0-9.]+(?=/)")
+
+
+def fake_containers(count: int, port: int, api_key: str, started_at: Optional[str] = None) -> list[dict]:
+    """Inspect-style records for count containers; the last one publishes port with api_key."""
+    containers = []
+    started_at = started_at or time.strftime("%Y-%m-%dT%H:%M:%S.000000000Z", time.gmtime())
+    for i in range(count):
+        is_target = i == count - 1
+        host_port = port if is_target else 20000 + i
+        name = f"space-{i}" if is_target else f"service-{i}"
+        env = ["PATH=/usr/local/bin:/usr/bin", f"SERVICE_INDEX={i}"]
+        if is_target:
+            env.append(f"SYFT_ADMIN_API_KEY={api_key}")
+        containers.append({
+            "Id": hashlib.sha256(name.encode()).hexdigest(),
+            "Name": f"/{name}",
+            "State": {"Status": "running", "Running": True, "StartedAt": started_at},
+            "Config": {"Image": "openmined/syft-space" if is_target else "busybox", "Env": env},
+            "NetworkSettings": {"Ports": {"8080/tcp": [{"HostIp": "0.0.0.0", "HostPort": str(host_port)}]}},
+        })
+    return containers
+
+
+def _summary(info: dict) -> dict:
+    """The GET /containers/json view of an inspect record."""
+    ports = [
+        {"IP": b["HostIp"], "PrivatePort": int(key.split("/")[0]), "PublicPort": int(b["HostPort"]), "Type": "tcp"}
+        for key, bindings in info["NetworkSettings"]["Ports"].items()
+        for b in bindings or []
+    ]
+    return {
+        "Id": info["Id"],
+        "Names": [info["Name"]],
+        "Image": info["Config"]["Image"],
+        "State": info["State"]["Status"],
+        "Ports": ports,
+    }
+
+
+class DockerStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    containers: dict[str, dict]
+    stats: Counter
+    lock: threading.Lock
+    latency = staticmethod(lambda: 0.0)
+
+    def address_string(self):
+        # Unix sockets have no peer address
+        return "unix"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        path = _VERSION_RE.sub("", self.path.split("?", 1)[0])
+        delay = self.latency()
+        if delay:
+            time.sleep(delay)
+        if path == "/_stats":
+            with self.lock:
+                return self._send(200, dict(self.stats))
+        if path == "/containers/json":
+            with self.lock:
+                self.stats["list"] += 1
+            return self._send(200, [_summary(info) for info in self.containers.values()])
+        match = re.fullmatch(r"/containers/([^/]+)/json", path)
+        if match:
+            with self.lock:
+                self.stats["inspect"] += 1
+            info = self.containers.get(match.group(1))
+            if info is None:
+                info = next((c for c in self.containers.values() if c["Name"] == f"/{match.group(1)}"), None)
+            if info is not None:
+                return self._send(200, info)
+            return self._send(404, {"message": f"No such container: {match.group(1)}"})
+        self._send(404, {"message": "page not found"})
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class DockerStubServer:
+    """Runs the Docker Engine stub on a unix socket in a background thread; use as a context manager."""
+
+    def __init__(self, socket_path: str, containers: list[dict], latency: str = "0"):
+        self.socket_path = socket_path
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        handler = type("BoundDockerStubHandler", (DockerStubHandler,), {
+            "containers": {c["Id"]: c for c in containers},
+            "stats": Counter(),
+            "lock": threading.Lock(),
+            "latency": staticmethod(parse_latency(latency)),
+        })
+        self.handler = handler
+        self.server = _UnixHTTPServer(socket_path, handler)
+        self._thread: Optional[threading.Thread] = None
+
+    def replace_containers(self, containers: list[dict]):
+        """Swap the running set, e.g. to simulate a container restart."""
+        with self.handler.lock:
+            self.handler.containers = {c["Id"]: c for c in containers}
+
+    def stats(self) -> dict:
+        with self.handler.lock:
+            return dict(self.handler.stats)
+
+    def start(self) -> "DockerStubServer":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--socket", default="/tmp/docker-stub.sock", help="Unix socket path (default: /tmp/docker-stub.sock)")
+    parser.add_argument("--containers", type=int, default=10, help="Running containers to report (default: 10)")
+    parser.add_argument("--port", type=int, default=8080, help="Host port of the Syft Space container (default: 8080)")
+    parser.add_argument("--api-key", default="stub-admin-key", help="Its SYFT_ADMIN_API_KEY (default: stub-admin-key)")
+    parser.add_argument("--latency", default="0", help="Per-request latency in ms, e.g. 'uniform:1,5' (default: 0)")
+    args = parser.parse_args()
+
+    stub = DockerStubServer(args.socket, fake_containers(args.containers, args.port, args.api_key), args.latency)
+    print(f"Docker Engine stub listening on {args.socket} ({args.containers} containers)")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.server.server_close()
+        os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""Local OpenRouter-compatible chat-completions stub for offline generate runs.
+
+Serves POST /api/v1/chat/completions, plain or streamed as server-sent
+events ("stream": true), with configurable time to first token, output
+token throughput, error injection, 429 throttling and mid-stream stalls.
+Replies are deterministic per dataset name and report OpenAI-style usage,
+so concurrency, batching and caching can be benchmarked reproducibly:
+
+    python -m stubs.openrouter --port 8090 --latency lognormal:300,0.4 --tokens-per-sec 80
+    OPENROUTER_API_KEY=stub python main.py generate --llm-base-url http://127.0.0.1:8090/api/v1 ...
+
+Prompts that ask for a JSON object (generate --batch-size) get one
+description per "**Dataset Name:**" in the prompt. GET /_stats returns
+request, status and token counters; POST /_reset clears them.
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+from collections import Counter
+from typing import Optional
+
+from ratelimit import TokenBucket
+from stubs.syft_space import StubHandler, StubServer, StubState, parse_latency
+
+API_PREFIX = "/api/v1"
+
+_NAME_RE = re.compile(r"\*\*Dataset Name:\*\*\s*(.+)")
+_WORDS = (
+    "dataset covers research articles reviews methods results clinical theory "
+    "applications data analysis models studies journal scope audience practitioners"
+).split()
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _description(name: str, tokens: int) -> str:
+    rng = random.Random(name)
+    words = [rng.choice(_WORDS) for _ in range(max(1, tokens - 4))]
+    return f"# {name}\n\n" + " ".join(words)
+
+
+class LLMStubState(StubState):
+    """Request, status and token counters shared by all handler threads."""
+
+    def __init__(self):
+        super().__init__()
+        self.tokens: Counter = Counter()
+
+    def reset(self):
+        super().reset()
+        with self.lock:
+            self.tokens.clear()
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        for key in ("datasets", "endpoints"):
+            stats.pop(key)
+        with self.lock:
+            stats["tokens"] = dict(self.tokens)
+        return stats
+
+
+class LLMStubConfig:
+    """Latency, throughput and fault knobs for the LLM stub."""
+
+    def __init__(
+        self,
+        latency: str = "0",
+        tokens_per_sec: float = 0.0,
+        completion_tokens: int = 300,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        max_rps: float = 0.0,
+        retry_after: float = 1.0,
+        stall_rate: float = 0.0,
+        stall_seconds: float = 60.0,
+        api_key: Optional[str] = None,
+    ):
+        self.latency = parse_latency(latency)
+        self.tokens_per_sec = tokens_per_sec
+        self.completion_tokens = completion_tokens
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.bucket = TokenBucket(max_rps, burst=max(1.0, max_rps)) if max_rps > 0 else None
+        self.retry_after = retry_after
+        self.stall_rate = stall_rate
+        self.stall_seconds = stall_seconds
+        self.api_key = api_key
+
+
+class LLMStubHandler(StubHandler):
+    config: LLMStubConfig
+
+    def _dispatch(self, method: str):
+        path = self.path.split("?", 1)[0]
+        if path == "/_stats" and method == "GET":
+            return self._send(200, self.state.stats())
+        if path == "/_reset" and method == "POST":
+            self.state.reset()
+            return self._send(200, {"reset": True})
+        if not (method == "POST" and path == f"{API_PREFIX}/chat/completions"):
+            return self._send(404, {"error": {"message": "Not found", "code": 404}})
+
+        body = self._body()
+        with self.state.lock:
+            self.state.requests["chat_completions"] += 1
+        start = time.monotonic()
+        try:
+            self._complete(body)
+        finally:
+            with self.state.lock:
+                self.state.seconds["chat_completions"] += time.monotonic() - start
+
+    def _error(self, status: int, message: str, headers: Optional[dict] = None):
+        self._send(status, {"error": {"message": message, "code": status}}, headers)
+
+    def _reply(self, body: dict) -> tuple[str, int]:
+        """Build the completion text and its token count for a request body."""
+        prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+        names = [n.strip() for n in _NAME_RE.findall(prompt)] or ["dataset"]
+        tokens = self.config.completion_tokens
+        if len(names) > 1 and "JSON object" in prompt:
+            content = json.dumps({name: _description(name, tokens) for name in names})
+            return content, tokens * len(names)
+        return _description(names[0], tokens), tokens
+
+    def _complete(self, body: dict):
+        config = self.config
+        if config.api_key and self.headers.get("Authorization") != f"Bearer {config.api_key}":
+            return self._error(401, "Invalid API key")
+        if (config.bucket and not config.bucket.try_acquire()) or random.random() < config.throttle_rate:
+            return self._error(429, "Rate limit exceeded", {"Retry-After": f"{config.retry_after:g}"})
+
+        time.sleep(config.latency())
+        if random.random() < config.error_rate:
+            return self._error(random.choice([500, 502, 503]), "Injected failure")
+
+        content, completion_tokens = self._reply(body)
+        prompt_tokens = _estimate_tokens(json.dumps(body.get("messages", [])))
+        with self.state.lock:
+            self.state.tokens["prompt"] += prompt_tokens
+            self.state.tokens["completion"] += completion_tokens
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        reply = {
+            "id": f"gen-{random.getrandbits(48):012x}",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+        }
+        if body.get("stream"):
+            return self._stream(content, reply, usage)
+
+        if config.tokens_per_sec > 0:
+            time.sleep(completion_tokens / config.tokens_per_sec)
+        self._send(200, {
+            **reply,
+            "object": "chat.completion",
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": usage,
+        })
+
+    def _chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _event(self, payload):
+        data = payload if isinstance(payload, str) else json.dumps(payload)
+        self._chunk(f"data: {data}\n\n".encode())
+
+    def _stream(self, content: str, reply: dict, usage: dict):
+        """Send the reply as SSE chunks, paced at tokens_per_sec (one word ~ one token)."""
+        config = self.config
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        with self.state.lock:
+            self.state.statuses[200] += 1
+
+        pieces = re.findall(r"\S+\s*|\s+", content)
+        stall_at = len(pieces) // 2 if random.random() < config.stall_rate else -1
+        start = time.monotonic()
+        chunk = {**reply, "object": "chat.completion.chunk"}
+        try:
+            # OpenRouter sends SSE comments while the model is warming up
+            self._chunk(b": OPENROUTER PROCESSING\n\n")
+            for i, piece in enumerate(pieces):
+                if i == stall_at:
+                    time.sleep(config.stall_seconds)
+                if config.tokens_per_sec > 0:
+                    delay = start + (i + 1) / config.tokens_per_sec - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                self._event({**chunk, "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]})
+            self._event({**chunk, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}], "usage": usage})
+            self._event("[DONE]")
+            self._chunk(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up (inactivity timeout or a hedge won)
+            self.close_connection = True
+
+
+class LLMStubServer(StubServer):
+    """Runs the LLM stub on a background thread; use as a context manager."""
+
+    handler_class = LLMStubHandler
+    state_class = LLMStubState
+    config_class = LLMStubConfig
+    prefix = API_PREFIX
+
+
+def add_llm_stub_arguments(parser: argparse.ArgumentParser, prefix: str = ""):
+    """Add the stub's knobs; prefix (e.g. "llm-") namespaces them for embedding tools."""
+    parser.add_argument(f"--{prefix}latency", default="0", help="Time to first token in ms, e.g. 'lognormal:300,0.4' (default: 0)")
+    parser.add_argument(f"--{prefix}tokens-per-sec", type=float, default=0.0, help="Output token throughput (0 = instant)")
+    parser.add_argument(f"--{prefix}completion-tokens", type=int, default=300, help="Tokens per description (default: 300)")
+    parser.add_argument(f"--{prefix}error-rate", type=float, default=0.0, help="Fraction of requests failing with 5xx")
+    parser.add_argument(f"--{prefix}throttle-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument(f"--{prefix}max-rps", type=float, default=0.0, help="Answer 429 above this many req/s (0 = off)")
+    parser.add_argument(f"--{prefix}retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument(f"--{prefix}stall-rate", type=float, default=0.0, help="Fraction of streams that stall halfway")
+    parser.add_argument(f"--{prefix}stall-seconds", type=float, default=60.0, help="How long a stalled stream pauses (default: 60)")
+
+
+def llm_config_from_args(args, prefix: str = "") -> LLMStubConfig:
+    attr = prefix.replace("-", "_")
+    return LLMStubConfig(
+        latency=getattr(args, f"{attr}latency"),
+        tokens_per_sec=getattr(args, f"{attr}tokens_per_sec"),
+        completion_tokens=getattr(args, f"{attr}completion_tokens"),
+        error_rate=getattr(args, f"{attr}error_rate"),
+        throttle_rate=getattr(args, f"{attr}throttle_rate"),
+        max_rps=getattr(args, f"{attr}max_rps"),
+        retry_after=getattr(args, f"{attr}retry_after"),
+        stall_rate=getattr(args, f"{attr}stall_rate"),
+        stall_seconds=getattr(args, f"{attr}stall_seconds"),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    add_llm_stub_arguments(parser)
+    parser.add_argument("--api-key", default=None, help="Require this bearer token (default: accept any)")
+    args = parser.parse_args()
+
+    config = llm_config_from_args(args)
+    config.api_key = args.api_key
+    server = LLMStubServer(config, args.host, args.port)
+    print(f"OpenRouter stub listening on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""In-memory stub of the Syft Space API for offline benchmarking and load tests.
+
+Serves the routes SyftClient uses under /api/v1 with configurable latency,
+error injection, 429 throttling and dataset ingestion delay:
+
+    python -m stubs.syft_space --port 8080 --latency lognormal:20,0.5 --error-rate 0.01 --max-rps 50
+
+GET /_stats returns per-route request counts, time spent and status codes; POST /_reset
+clears state and stats.
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+from ratelimit import TokenBucket
+
+API_PREFIX = "/api/v1"
+
+
+def parse_latency(spec: str) -> Callable[[], float]:
+    """Build a latency sampler (seconds) from a spec in milliseconds.
+
+    Specs: "0" or "fixed:MS", "uniform:LO,HI", "exponential:MEAN",
+    "lognormal:MEDIAN,SIGMA".
+    """
+    kind, _, params = spec.partition(":")
+    if not params:
+        kind, params = "fixed", kind
+    values = [float(v) / 1000 for v in params.split(",")]
+    if kind == "fixed":
+        return lambda: values[0]
+    if kind == "uniform":
+        return lambda: random.uniform(values[0], values[1])
+    if kind == "exponential":
+        return lambda: random.expovariate(1 / values[0]) if values[0] > 0 else 0.0
+    if kind == "lognormal":
+        # SIGMA is unitless, so undo the ms -> s scaling applied above
+        median, sigma = values[0], values[1] * 1000
+        return lambda: random.lognormvariate(math.log(median), sigma) if median > 0 else 0.0
+    raise ValueError(f"unknown latency distribution '{kind}'")
+
+
+class StubState:
+    """Datasets, endpoints and request statistics shared by all handler threads."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.datasets: dict[str, dict] = {}
+        self.endpoints: dict[str, dict] = {}
+        self.next_id = 1
+        self.requests: Counter = Counter()
+        self.seconds: Counter = Counter()
+        self.statuses: Counter = Counter()
+        self.started = time.monotonic()
+
+    def reset(self):
+        with self.lock:
+            self.datasets.clear()
+            self.endpoints.clear()
+            self.next_id = 1
+            self.requests.clear()
+            self.seconds.clear()
+            self.statuses.clear()
+            self.started = time.monotonic()
+
+    def stats(self) -> dict:
+        with self.lock:
+            elapsed = time.monotonic() - self.started
+            total = sum(self.requests.values())
+            return {
+                "requests": total,
+                "elapsed": elapsed,
+                "requests_per_sec": total / elapsed if elapsed > 0 else 0.0,
+                "by_route": dict(self.requests),
+                "seconds_by_route": dict(self.seconds),
+                "by_status": {str(k): v for k, v in self.statuses.items()},
+                "datasets": len(self.datasets),
+                "endpoints": len(self.endpoints),
+            }
+
+
+class StubConfig:
+    """Fault and latency knobs for the stub."""
+
+    def __init__(
+        self,
+        latency: str = "0",
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        max_rps: float = 0.0,
+        retry_after: float = 1.0,
+        ingest_delay: str = "0",
+        api_key: Optional[str] = None,
+    ):
+        self.latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.bucket = TokenBucket(max_rps, burst=max(1.0, max_rps)) if max_rps > 0 else None
+        self.retry_after = retry_after
+        self.ingest_delay = parse_latency(ingest_delay)
+        self.api_key = api_key
+
+
+# (method, pattern, route name); route names key the /_stats counters
+_ROUTES = [
+    ("GET", r"/datasets/types/", "list_types"),
+    ("GET", r"/datasets/", "list_datasets"),
+    ("POST", r"/datasets/", "create_dataset"),
+    ("GET", r"/datasets/(?P<key>[^/]+)", "get_dataset"),
+    ("DELETE", r"/datasets/(?P<key>[^/]+)", "delete_dataset"),
+    ("GET", r"/endpoints/", "list_endpoints"),
+    ("POST", r"/endpoints/", "create_endpoint"),
+    ("POST", r"/endpoints/(?P<key>[^/]+)/publish", "publish_endpoint"),
+    ("GET", r"/endpoints/(?P<key>[^/]+)", "get_endpoint"),
+    ("PATCH", r"/endpoints/(?P<key>[^/]+)", "update_endpoint"),
+    ("DELETE", r"/endpoints/(?P<key>[^/]+)", "delete_endpoint"),
+]
+_COMPILED = [(method, re.compile(pattern + "$"), name) for method, pattern, name in _ROUTES]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    state: StubState
+    config: StubConfig
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, body=None, headers: Optional[dict] = None):
+        data = b"" if body is None else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+        with self.state.lock:
+            self.state.statuses[status] += 1
+
+    def _body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    def _dispatch(self, method: str):
+        path = self.path.split("?", 1)[0]
+        if path == "/_stats" and method == "GET":
+            return self._send(200, self.state.stats())
+        if path == "/_reset" and method == "POST":
+            self.state.reset()
+            return self._send(200, {"reset": True})
+        if not path.startswith(API_PREFIX):
+            return self._send(404, {"detail": "Not found"})
+        path = path[len(API_PREFIX):]
+
+        for route_method, pattern, name in _COMPILED:
+            match = pattern.match(path)
+            if match and route_method == method:
+                break
+        else:
+            return self._send(404, {"detail": "Not found"})
+
+        body = self._body() if method in ("POST", "PATCH") else {}
+        with self.state.lock:
+            self.state.requests[name] += 1
+        start = time.monotonic()
+        try:
+            self._handle(name, match, body)
+        finally:
+            with self.state.lock:
+                self.state.seconds[name] += time.monotonic() - start
+
+    def _handle(self, name: str, match: re.Match, body: dict):
+        config = self.config
+        if config.api_key and self.headers.get("Authorization") != f"Bearer {config.api_key}":
+            return self._send(401, {"detail": "Invalid API key"})
+        if (config.bucket and not config.bucket.try_acquire()) or random.random() < config.throttle_rate:
+            return self._send(429, {"detail": "Too many requests"}, {"Retry-After": f"{config.retry_after:g}"})
+
+        time.sleep(config.latency())
+        if random.random() < config.error_rate:
+            return self._send(random.choice([500, 502, 503]), {"detail": "Injected failure"})
+
+        getattr(self, f"_{name}")(match.group("key") if "key" in match.groupdict() else None, body)
+
+    # -- Route handlers --
+
+    def _list_types(self, key, body):
+        self._send(200, [{"name": "local_file"}])
+
+    def _list_datasets(self, key, body):
+        with self.state.lock:
+            datasets = list(self.state.datasets.values())
+        self._send(200, datasets)
+
+    def _create_dataset(self, key, body):
+        # Real ingestion indexes the files before the create call returns
+        time.sleep(self.config.ingest_delay())
+        with self.state.lock:
+            exists = body.get("name") in self.state.datasets
+            if not exists:
+                dataset = {**body, "id": str(self.state.next_id)}
+                self.state.next_id += 1
+                self.state.datasets[body["name"]] = dataset
+        if exists:
+            return self._send(409, {"detail": f"Dataset '{body.get('name')}' already exists"})
+        self._send(201, dataset)
+
+    def _get_dataset(self, key, body):
+        with self.state.lock:
+            dataset = self.state.datasets.get(key)
+        self._send(200, dataset) if dataset else self._send(404, {"detail": "Not found"})
+
+    def _delete_dataset(self, key, body):
+        with self.state.lock:
+            found = self.state.datasets.pop(key, None)
+        self._send(204) if found else self._send(404, {"detail": "Not found"})
+
+    def _list_endpoints(self, key, body):
+        with self.state.lock:
+            endpoints = list(self.state.endpoints.values())
+        self._send(200, endpoints)
+
+    def _create_endpoint(self, key, body):
+        with self.state.lock:
+            exists = body.get("slug") in self.state.endpoints
+            if not exists:
+                endpoint = {**body, "published_to": []}
+                self.state.endpoints[body["slug"]] = endpoint
+        if exists:
+            return self._send(409, {"detail": f"Endpoint '{body.get('slug')}' already exists"})
+        self._send(201, endpoint)
+
+    def _get_endpoint(self, key, body):
+        with self.state.lock:
+            endpoint = self.state.endpoints.get(key)
+        self._send(200, endpoint) if endpoint else self._send(404, {"detail": "Not found"})
+
+    def _update_endpoint(self, key, body):
+        with self.state.lock:
+            endpoint = self.state.endpoints.get(key)
+            if endpoint:
+                endpoint.update(body)
+        self._send(200, endpoint) if endpoint else self._send(404, {"detail": "Not found"})
+
+    def _delete_endpoint(self, key, body):
+        with self.state.lock:
+            found = self.state.endpoints.pop(key, None)
+        self._send(204) if found else self._send(404, {"detail": "Not found"})
+
+    def _publish_endpoint(self, key, body):
+        with self.state.lock:
+            endpoint = self.state.endpoints.get(key)
+            if endpoint:
+                endpoint["published"] = True
+                endpoint["published_to"] = ["https://syfthub.openmined.org"]
+        self._send(200, {"published": True}) if endpoint else self._send(404, {"detail": "Not found"})
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+
+class StubServer:
+    """Runs the stub on a background thread; use as a context manager.
+
+    Subclasses swap in another API by overriding the class attributes.
+    """
+
+    handler_class = StubHandler
+    state_class = StubState
+    config_class = StubConfig
+    prefix = API_PREFIX
+
+    def __init__(self, config=None, host: str = "127.0.0.1", port: int = 0):
+        self.state = self.state_class()
+        handler = type(
+            f"Bound{self.handler_class.__name__}",
+            (self.handler_class,),
+            {"state": self.state, "config": config or self.config_class()},
+        )
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{self.prefix}"
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def add_stub_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency", default="0", help="Per-request latency in ms, e.g. 'lognormal:20,0.5' (default: 0)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with 5xx")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--max-rps", type=float, default=0.0, help="Answer 429 above this many req/s (0 = off)")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--ingest-delay", default="0", help="Extra dataset-create latency in ms (same spec as --latency)")
+    parser.add_argument("--api-key", default=None, help="Require this bearer token (default: accept any)")
+
+
+def config_from_args(args) -> StubConfig:
+    return StubConfig(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        max_rps=args.max_rps,
+        retry_after=args.retry_after,
+        ingest_delay=args.ingest_delay,
+        api_key=args.api_key,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    server = StubServer(config_from_args(args), args.host, args.port)
+    print(f"Syft Space stub listening on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,16 @@
-"""Shared utilities: dataset discovery, file type detection, progress tracking."""
+"""Shared utilities: dataset discovery and scanning, file type detection, progress tracking, fingerprints, streaming JSON."""
 
+import hashlib
 import json
+import os
 import re
-import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
 from urllib.parse import urlparse
 
+from docker_api import DEFAULT_DOCKER_SOCKET, ApiKeyCache, resolve_container_key
+
 
 def slugify(text: str, max_length: int = 63) -> str:
     """Convert text to a URL-safe slug only if it contains spaces or bad characters.
@@ -31,84 +36,302 @@ def slugify(text: str, max_length: int = 63) -> str:
     return slug
 
 
-def discover_datasets(source_dir: Path) -> list[str]:
-    """Return sorted list of subdirectory names under source_dir.
+# Written by generate next to each dataset's metadata
+DESCRIPTION_FILENAME = "journal_description.md"
+
+METADATA_SUFFIXES = (".json", ".jsonl")
+
+
+class DatasetInfo:
+    """One dataset directory as seen by a single scan of the source tree.
+
+    metadata_files holds the sorted names of the directory's .json/.jsonl
+    files and mtime is the directory's modification time, so commands can
+    read everything they need about a dataset without touching the disk again.
+    file_count and extensions (a {".pdf": count} histogram of every file
+    below the directory) are filled in by scan_file_types or the source
+    index (source_index.py), total_bytes only by the index; a plain scan
+    leaves them None.
+    """
+
+    __slots__ = (
+        "name", "path", "has_description", "metadata_files", "mtime", "file_count", "total_bytes", "extensions",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        path: Path,
+        has_description: bool,
+        metadata_files: tuple[str, ...],
+        mtime: float,
+        file_count: Optional[int] = None,
+        total_bytes: Optional[int] = None,
+        extensions: Optional[dict[str, int]] = None,
+    ):
+        self.name = name
+        self.path = path
+        self.has_description = has_description
+        self.metadata_files = metadata_files
+        self.mtime = mtime
+        self.file_count = file_count
+        self.total_bytes = total_bytes
+        self.extensions = extensions
+
+    @property
+    def description_path(self) -> Path:
+        return self.path / DESCRIPTION_FILENAME
+
+    @property
+    def metadata_paths(self) -> list[Path]:
+        return [self.path / name for name in self.metadata_files]
+
+    def __repr__(self):
+        return f"DatasetInfo({self.name!r}, description={self.has_description}, metadata={len(self.metadata_files)})"
+
+
+def dataset_entries(source_dir: Path) -> list[os.DirEntry]:
+    """Sorted DirEntry objects for the non-hidden subdirectories of source_dir."""
+    # DirEntry.is_dir() uses the type from the directory listing, so no stat per entry
+    with os.scandir(source_dir) as entries:
+        found = [e for e in entries if not e.name.startswith(".") and e.is_dir()]
+    found.sort(key=lambda e: e.name)
+    return found
+
+
+def scan_dataset(entry: os.DirEntry) -> DatasetInfo:
+    """Build the DatasetInfo for one dataset directory with a single listing."""
+    has_description = False
+    metadata_files = []
+    with os.scandir(entry.path) as children:
+        for child in children:
+            if child.name == DESCRIPTION_FILENAME:
+                has_description = child.is_file()
+            elif child.name.endswith(METADATA_SUFFIXES) and child.is_file():
+                metadata_files.append(child.name)
+    metadata_files.sort()
+    return DatasetInfo(
+        entry.name, Path(entry.path), has_description, tuple(metadata_files), entry.stat().st_mtime
+    )
+
+
+def scan_datasets(source_dir: Path) -> list[DatasetInfo]:
+    """Scan source_dir once and return a DatasetInfo per dataset, sorted by name.
+
+    Costs one directory listing for the tree, plus one listing and one stat
+    (for mtime) per dataset. File types come from the listings themselves.
+    """
+    return [scan_dataset(entry) for entry in dataset_entries(source_dir)]
+
+
+def walk_dataset(path: str, stat_entries: bool = True) -> tuple[int, dict, bool, list[str], int, Optional[int], dict]:
+    """List every directory and file below one dataset directory.
 
-    Every non-hidden subdirectory is treated as a dataset.
+    Returns (mtime_ns, subdir_mtimes, has_description, metadata_files,
+    file_count, total_bytes, extensions); subdir_mtimes maps each
+    subdirectory's path relative to the dataset to its mtime in ns, and
+    extensions counts files per lower-cased suffix (journal_description.md
+    is left out). Without stat_entries nothing below the dataset is
+    stat'ed: names and types come from the listings, subdir_mtimes is empty
+    and total_bytes is None. Directories are read one at a time from an
+    explicit stack, so memory is bounded by the largest single directory,
+    not the tree.
     """
-    datasets = []
-    for item in sorted(source_dir.iterdir()):
-        if item.is_dir() and not item.name.startswith("."):
-            datasets.append(item.name)
-    return datasets
+    mtime_ns = os.stat(path).st_mtime_ns
+    subdir_mtimes = {}
+    has_description = False
+    metadata_files = []
+    file_count = total_bytes = 0
+    extensions: dict[str, int] = {}
+    stack = [("", path)]
+    while stack:
+        rel, current = stack.pop()
+        try:
+            listing = os.scandir(current)
+        except OSError:
+            continue
+        with listing:
+            for entry in listing:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        child = f"{rel}/{entry.name}" if rel else entry.name
+                        if stat_entries:
+                            subdir_mtimes[child] = entry.stat(follow_symlinks=False).st_mtime_ns
+                        stack.append((child, entry.path))
+                        continue
+                    if not entry.is_file():
+                        continue
+                    size = entry.stat().st_size if stat_entries else 0
+                except OSError:
+                    continue
+                file_count += 1
+                total_bytes += size
+                if not rel and entry.name == DESCRIPTION_FILENAME:
+                    # Our own output, not dataset content: generating it mustn't change the file types
+                    has_description = True
+                    continue
+                suffix = os.path.splitext(entry.name)[1].lower()
+                if suffix:
+                    extensions[suffix] = extensions.get(suffix, 0) + 1
+                if not rel and entry.name.endswith(METADATA_SUFFIXES):
+                    metadata_files.append(entry.name)
+    metadata_files.sort()
+    if not stat_entries:
+        total_bytes = None
+    return mtime_ns, subdir_mtimes, has_description, metadata_files, file_count, total_bytes, extensions
 
 
-def detect_file_types(source_dir: Path, sample_limit: int = 100) -> list[str]:
-    """Auto-detect file extensions present in the first dataset subdirectory.
+def scan_file_types(datasets: list[DatasetInfo], workers: int = 16) -> int:
+    """Fill in file_count and extensions for every dataset that lacks them.
 
-    Scans up to sample_limit files to keep it fast on large directories.
+    Each dataset's whole tree is listed (walk_dataset, without a stat per
+    file) on a pool of ``workers`` threads; directory reads release the
+    GIL, so the walks overlap on slow or network filesystems. Datasets
+    loaded from the source index already have their histograms and are
+    skipped. Returns the number of datasets walked.
     """
-    datasets = discover_datasets(source_dir)
-    if not datasets:
-        return []
+    todo = [d for d in datasets if d.extensions is None]
 
-    first_dir = source_dir / datasets[0]
-    extensions = set()
-    for i, f in enumerate(first_dir.rglob("*")):
-        if i >= sample_limit:
-            break
-        if f.is_file() and f.suffix:
-            extensions.add(f.suffix.lower())
-    return sorted(extensions)
+    def walk(chunk: list[DatasetInfo]):
+        for dataset in chunk:
+            try:
+                _, _, _, _, dataset.file_count, _, dataset.extensions = walk_dataset(
+                    str(dataset.path), stat_entries=False
+                )
+            except OSError:
+                dataset.file_count, dataset.extensions = 0, {}
 
+    # A few datasets per task keeps executor overhead small next to the walks
+    chunks = [todo[i:i + 16] for i in range(0, len(todo), 16)]
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        list(pool.map(walk, chunks))
+    return len(todo)
 
-def resolve_api_key(api_url: str) -> str:
+
+def resolve_api_key(
+    api_url: str,
+    docker_socket: str = DEFAULT_DOCKER_SOCKET,
+    cache: Optional[ApiKeyCache] = None,
+    refresh: bool = False,
+) -> str:
     """Resolve the API key from the Docker container matching the api_url port.
 
-    Inspects running Syft Space containers, finds the one whose published port
-    matches the port in api_url, and returns its SYFT_ADMIN_API_KEY env var.
+    Finds the running Syft Space container whose published port matches the
+    port in api_url (see docker_api.find_container_key) and returns its
+    SYFT_ADMIN_API_KEY env var, or "" if there is none. With a cache, a
+    mapping whose container is unchanged is reused; refresh forces a new
+    lookup.
     """
     try:
-        parsed = urlparse(api_url)
-        target_port = str(parsed.port or 8080)
-
-        result = subprocess.run(
-            ["docker", "ps", "--format", "{{.Names}}"],
-            capture_output=True, text=True, timeout=5,
-        )
-        if result.returncode != 0:
-            return ""
-
-        for name in result.stdout.strip().splitlines():
-            inspect = subprocess.run(
-                ["docker", "inspect", name, "--format",
-                 "{{range $p, $b := .NetworkSettings.Ports}}{{range $b}}{{.HostPort}} {{end}}{{end}}"],
-                capture_output=True, text=True, timeout=5,
-            )
-            ports = inspect.stdout.strip().split()
-            if target_port in ports:
-                env_out = subprocess.run(
-                    ["docker", "inspect", name, "--format",
-                     "{{range .Config.Env}}{{println .}}{{end}}"],
-                    capture_output=True, text=True, timeout=5,
-                )
-                for line in env_out.stdout.splitlines():
-                    if line.startswith("SYFT_ADMIN_API_KEY="):
-                        return line.split("=", 1)[1]
-        return ""
-    except Exception:
+        port = urlparse(api_url).port or 8080
+    except ValueError:
         return ""
+    found = resolve_container_key(port, docker_socket, cache, refresh)
+    return found.api_key if found else ""
+
+
+def fingerprint(value) -> str:
+    """Stable short content hash of a JSON-serializable value."""
+    data = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(data.encode()).hexdigest()[:16]
+
+
+_JSON_DECODER = json.JSONDecoder()
+_JSON_WHITESPACE = " \t\r\n"
+_JSON_NUMBER_CHARS = frozenset("0123456789+-.eE")
+
+
+def iter_json_items(path: Path, limit: int | None = None, chunk_size: int = 1 << 16, max_item_bytes: int = 64 << 20):
+    """Yield items from a JSON array, a single JSON value, or a JSON Lines file.
+
+    The file is read in chunks and decoded one item at a time, so memory is
+    bounded by the largest item rather than the file, and reading stops once
+    ``limit`` items have been yielded. A top-level array yields its elements;
+    otherwise each top-level value (one object, or one per line) is an item.
+    Raises ValueError on malformed JSON or an item over ``max_item_bytes``.
+    """
+    if limit is not None and limit <= 0:
+        return
+    with open(path, encoding="utf-8-sig") as f:
+        buf, pos, eof = "", 0, False
+        in_array = None
+        # Inside an array, values and commas must alternate
+        expect_value = True
+        read_size = chunk_size
+        count = 0
+        while True:
+            # Skip whitespace, refilling once the buffer is used up
+            while True:
+                while pos < len(buf) and buf[pos] in _JSON_WHITESPACE:
+                    pos += 1
+                if pos < len(buf) or eof:
+                    break
+                buf, pos = f.read(chunk_size), 0
+                eof = not buf
+            if pos >= len(buf):
+                if in_array:
+                    raise ValueError(f"{path}: unterminated JSON array")
+                return
+
+            char = buf[pos]
+            if in_array is None:
+                in_array = char == "["
+                if in_array:
+                    pos += 1
+                    continue
+            elif in_array:
+                if char == "]":
+                    if expect_value and count:
+                        raise ValueError(f"{path}: trailing comma in JSON array")
+                    return
+                if char == ",":
+                    if expect_value:
+                        raise ValueError(f"{path}: unexpected comma in JSON array")
+                    expect_value = True
+                    pos += 1
+                    continue
+                if not expect_value:
+                    raise ValueError(f"{path}: missing comma between JSON array items")
+
+            try:
+                item, end = _JSON_DECODER.raw_decode(buf, pos)
+                complete = eof
+                if not eof:
+                    # A number may go on past the buffer edge: "12" or "12." + "5"
+                    # decode as 12 until a character that can't extend it follows
+                    tail = end
+                    if isinstance(item, (int, float)) and not isinstance(item, bool):
+                        while tail < len(buf) and buf[tail] in _JSON_NUMBER_CHARS:
+                            tail += 1
+                    complete = tail < len(buf)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                complete = False
+            if not complete:
+                if len(buf) - pos > max_item_bytes:
+                    raise ValueError(f"{path}: JSON item larger than {max_item_bytes} bytes")
+                chunk = f.read(read_size)
+                eof = not chunk
+                buf, pos = buf[pos:] + chunk, 0
+                # Grow reads for a large item so re-decoding it stays cheap
+                read_size *= 2
+                continue
+
+            read_size = chunk_size
+            pos = end
+            expect_value = False
+            yield item
+            count += 1
+            if limit is not None and count >= limit:
+                return
 
 
 def load_progress(path: Path) -> dict:
-    """Load progress from a JSON file."""
+    """Load progress from a legacy progress.json file (see progress_store for the current store)."""
     if path.exists():
         with open(path) as f:
-            return json.load(f)
-    return {"deployed": [], "updated": [], "failed": []}
-
-
-def save_progress(path: Path, progress: dict):
-    """Save progress to a JSON file."""
-    with open(path, "w") as f:
-        json.dump(progress, f, indent=2)
+            progress = json.load(f)
+        progress.setdefault("fingerprints", {})
+        return progress
+    return {"deployed": [], "updated": [], "failed": [], "fingerprints": {}}